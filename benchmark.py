@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the job monitor's hot paths.
+
+Usage:
+    python3 benchmark.py                 # run every benchmark
+    python3 benchmark.py field_paths     # run a single benchmark
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime
+
+import json_codec
+from html_backends import HTML_PARSERS
+from scrapping import JobFilter, JobMonitor, compile_field_path
+from storage import BinaryStorage, EventLogStorage, JsonStorage, ShardedStorage, SqliteStorage
+
+
+def make_api_jobs(count):
+    """Build a synthetic Greenhouse-style board"""
+    departments = ['Engineering', 'Product', 'Data', 'Sales', 'Marketing', 'Finance', 'Legal', 'Operations']
+    locations = ['Dubai, United Arab Emirates', 'Cairo, Egypt', 'Berlin, Germany', 'Remote']
+    return [
+        {
+            'title': f"Job {i}",
+            'absolute_url': f"https://boards.greenhouse.io/example/jobs/{i}",
+            'location': {'name': locations[i % len(locations)]},
+            'metadata': [{'value': None}] * 4 + [{'value': departments[i % len(departments)]}],
+        }
+        for i in range(count)
+    ]
+
+
+def report(name, baseline, optimized):
+    """Print a timing comparison"""
+    print(f"{name:<40} {baseline * 1000:9.1f} ms -> {optimized * 1000:9.1f} ms  ({baseline / optimized:.1f}x)")
+
+
+def best_of(func, repeat=5):
+    """Best wall time of several runs"""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def legacy_get_nested_field(data, field_path):
+    """get_nested_field as it was before field paths were compiled"""
+    if not field_path:
+        return ''
+    
+    value = data
+    for key in str(field_path).split('.'):
+        if isinstance(value, dict):
+            value = value.get(key, '')
+        elif isinstance(value, list) and key.isdigit():
+            idx = int(key)
+            value = value[idx] if idx < len(value) else ''
+        else:
+            return ''
+    
+    return value
+
+
+def bench_field_paths():
+    """Four field lookups per job, split on every call vs compiled once per board"""
+    paths = ['title', 'metadata.4.value', 'location.name', 'absolute_url']
+    
+    for count in (10_000, 100_000):
+        jobs = make_api_jobs(count)
+        
+        def legacy():
+            for job in jobs:
+                for path in paths:
+                    legacy_get_nested_field(job, path)
+        
+        def compiled():
+            accessors = [compile_field_path(path) for path in paths]
+            for job in jobs:
+                for accessor in accessors:
+                    accessor.get(job)
+        
+        assert all(
+            legacy_get_nested_field(job, path) == compile_field_path(path).get(job)
+            for job in jobs[:1000] for path in paths
+        )
+        report(f"field paths ({count:,} jobs)", best_of(legacy), best_of(compiled))
+
+
+def make_tracked_jobs(count):
+    """Build a synthetic tracked_jobs.json document"""
+    jobs = [
+        {
+            'id': f"{i:032x}",
+            'company': f"Company {i % 300}",
+            'title': f"Senior Software Engineer {i}" + (" - Plateforme Données" if i % 20 == 0 else ""),
+            'department': ['Engineering', 'Product', 'Data', 'Design'][i % 4],
+            'location': 'Dubai, United Arab Emirates',
+            'link': f"https://boards.greenhouse.io/example/jobs/{i}?gh_jid={i}",
+            'found_date': '2026-05-18 09:37:10',
+            'is_active': i % 3 != 0,
+            'is_new': False,
+            'last_seen': '2026-06-13 19:05:41'
+        }
+        for i in range(count)
+    ]
+    return {'jobs': jobs, 'metadata': {'last_updated': '2026-06-13 19:05:41', 'total_jobs': count}}
+
+
+def bench_json_codec():
+    """Loading and saving tracked_jobs.json with the stdlib vs the json_codec backend"""
+    print(f"json_codec backend: {json_codec.BACKEND}")
+    
+    for count in (10_000, 100_000):
+        data = make_tracked_jobs(count)
+        text = json.dumps(data, indent=2)
+        raw = text.encode()
+        
+        assert json_codec.dumps_pretty(data) == text
+        assert json_codec.loads(raw) == data
+        
+        report(f"save ({count:,} jobs)", best_of(lambda: json.dumps(data, indent=2)),
+               best_of(lambda: json_codec.dumps_pretty(data)))
+        report(f"load ({count:,} jobs)", best_of(lambda: json.loads(raw)),
+               best_of(lambda: json_codec.loads(raw)))
+
+
+def legacy_matches_filters(department, location, config):
+    """matches_filters as it was before filters were compiled"""
+    dept_filter = config.get('departments', [])
+    loc_filter = config.get('locations', [])
+    
+    dept_match = not dept_filter or any(
+        d.lower() in str(department).lower() for d in dept_filter
+    )
+    
+    loc_match = not loc_filter or any(
+        loc.lower() in str(location).lower() for loc in loc_filter
+    )
+    
+    return dept_match and loc_match
+
+
+def make_filter_terms(count):
+    """Build department filter terms, padded with terms no job matches"""
+    terms = ['Product', 'Engineering', 'Data']
+    return terms + [f"Team {i} Unit" for i in range(count - len(terms))]
+
+
+def bench_filters():
+    """Department/location filters per job, substring loop vs one compiled matcher"""
+    rows = [
+        (job['metadata'][4]['value'], job['location']['name'])
+        for job in make_api_jobs(100_000)
+    ]
+    
+    for term_count in (3, 100, 500):
+        config = {'departments': make_filter_terms(term_count), 'locations': ['Dubai']}
+        job_filter = JobFilter(config)
+        
+        def legacy():
+            for department, location in rows:
+                legacy_matches_filters(department, location, config)
+        
+        def compiled():
+            for department, location in rows:
+                job_filter.matches(department, location)
+        
+        assert all(
+            legacy_matches_filters(department, location, config) == job_filter.matches(department, location)
+            for department, location in rows[:1000]
+        )
+        report(f"filters ({term_count} terms, 100,000 jobs)", best_of(legacy, repeat=3), best_of(compiled, repeat=3))
+
+
+def make_career_page(count):
+    """Build a synthetic career page with navigation, scripts and job cards"""
+    departments = ['Engineering', 'Product', 'Data', 'Sales', 'Marketing', 'Finance', 'Legal', 'Operations']
+    nav = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(200))
+    script = '<script>window.__STATE__ = {"tracking": "' + 'x' * 20_000 + '"};</script>'
+    cards = ''.join(
+        f'<div class="job-card"><h3 class="job-title"><span>Job</span> {i}</h3>'
+        f'<span class="job-dept">{departments[i % len(departments)]}</span>'
+        f'<a class="job-link" href="/jobs/{i}">Apply</a></div>'
+        for i in range(count)
+    )
+    return (
+        f'<html><head><title>Careers</title>{script}<style>.a {{ color: red; }}</style></head>'
+        f'<body><nav><ul>{nav}</ul></nav><main id="jobs">{cards}</main>'
+        f'<footer>{nav}</footer>{script}</body></html>'
+    )
+
+
+def extract_html_fields(backend, html, container_selector=None):
+    """Parse a career page and read the fields the monitor uses"""
+    document = backend.parse(html, container_selector)
+    rows = []
+    for job_elem in backend.select(document, 'div.job-card'):
+        title_elem = backend.select_one(job_elem, '.job-title')
+        dept_elem = backend.select_one(job_elem, '.job-dept')
+        link_elem = backend.select_one(job_elem, 'a.job-link')
+        rows.append((backend.get_text(title_elem), backend.get_text(dept_elem), backend.get_attr(link_elem, 'href')))
+    return rows
+
+
+def bench_html_parsers():
+    """Parsing a career page with each installed html_parser backend"""
+    baseline_backend = HTML_PARSERS['html.parser']
+    
+    for count in (100, 1_000):
+        html = make_career_page(count)
+        expected = extract_html_fields(baseline_backend, html)
+        baseline = best_of(lambda: extract_html_fields(baseline_backend, html), repeat=3)
+        
+        for name, backend in HTML_PARSERS.items():
+            if backend is None:
+                print(f"html_parser {name}: not installed")
+                continue
+            if backend is baseline_backend:
+                continue
+            assert extract_html_fields(backend, html) == expected
+            report(f"{name} ({count:,} jobs)", baseline,
+                   best_of(lambda: extract_html_fields(backend, html), repeat=3))
+
+
+def peak_memory(func):
+    """Peak traced allocation while running func"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_container_selector():
+    """Parsing the whole career page vs only the job container"""
+    for name, backend in HTML_PARSERS.items():
+        if backend is None:
+            continue
+        
+        html = make_career_page(200)
+        assert extract_html_fields(backend, html, 'main#jobs') == extract_html_fields(backend, html)
+        
+        report(f"{name} container_selector", best_of(lambda: extract_html_fields(backend, html), repeat=3),
+               best_of(lambda: extract_html_fields(backend, html, 'main#jobs'), repeat=3))
+        
+        # lxml and selectolax build their trees outside the Python heap
+        if name == 'html.parser':
+            whole = peak_memory(lambda: extract_html_fields(backend, html))
+            scoped = peak_memory(lambda: extract_html_fields(backend, html, 'main#jobs'))
+            print(f"{name + ' peak memory':<40} {whole / 1024:9.0f} KB -> {scoped / 1024:9.0f} KB")
+
+
+PUSHDOWN_DEPARTMENTS = [f"Department {i}" for i in range(19)] + ['Engineering']
+PUSHDOWN_CONFIG = {
+    'name': 'Example',
+    'api_url': 'https://example.com/api/jobs',
+    'url': 'https://example.com/careers',
+    'api_title_field': 'title',
+    'api_department_field': 'metadata.4.value',
+    'api_location_field': 'location.name',
+    'api_link_field': 'absolute_url',
+    'job_selector': 'div.job-card',
+    'title_selector': '.job-title',
+    'department_selector': '.job-dept',
+    'link_selector': 'a.job-link',
+    'departments': ['Engineering'],
+    'locations': ['Dubai']
+}
+
+
+def legacy_iter_api_jobs(company_config, jobs_data):
+    """API extraction with every field read before filtering"""
+    title_field = compile_field_path(company_config['api_title_field'])
+    department_field = compile_field_path(company_config['api_department_field'])
+    location_field = compile_field_path(company_config['api_location_field'])
+    link_field = compile_field_path(company_config['api_link_field'])
+    job_filter = JobFilter(company_config)
+    
+    for job_data in jobs_data:
+        title = title_field.get(job_data)
+        department = department_field.get(job_data)
+        location = location_field.get(job_data)
+        link = link_field.get(job_data)
+        
+        if link and not link.startswith('http'):
+            base = company_config.get('base_url', company_config['api_url'].split('/api')[0])
+            link = base.rstrip('/') + '/' + link.lstrip('/')
+        
+        if job_filter.matches(department, location):
+            yield (str(title), str(department), str(location), link)
+
+
+def legacy_extract_html_jobs(backend, company_config, html):
+    """HTML extraction with every field selected before filtering"""
+    job_filter = JobFilter(company_config)
+    jobs = []
+    for job_elem in backend.select(backend.parse(html), company_config['job_selector']):
+        title_elem = backend.select_one(job_elem, company_config['title_selector'])
+        dept_elem = backend.select_one(job_elem, company_config['department_selector'])
+        link_elem = backend.select_one(job_elem, company_config['link_selector'])
+        
+        title = backend.get_text(title_elem)
+        department = backend.get_text(dept_elem) if dept_elem is not None else "Unknown"
+        link = backend.get_attr(link_elem, 'href') if link_elem is not None else ''
+        
+        if link and not link.startswith('http'):
+            base_url = '/'.join(company_config['url'].split('/')[:3])
+            link = base_url + link if link.startswith('/') else base_url + '/' + link
+        
+        if job_filter.matches(department, ''):
+            jobs.append((title, department, '', link))
+    return jobs
+
+
+def bench_filter_pushdown():
+    """Extracting every field before filtering vs filter fields first, 5% of jobs matching"""
+    monitor = JobMonitor(config_file='')
+    api_config = dict(PUSHDOWN_CONFIG)
+    html_config = dict(PUSHDOWN_CONFIG, locations=[])
+    
+    jobs = [
+        {
+            'title': f"Job {i}",
+            'absolute_url': f"/example/jobs/{i}",
+            'location': {'name': 'Dubai, United Arab Emirates'},
+            'metadata': [{'value': None}] * 4 + [{'value': PUSHDOWN_DEPARTMENTS[i % len(PUSHDOWN_DEPARTMENTS)]}],
+        }
+        for i in range(100_000)
+    ]
+    as_rows = lambda found: [(job['title'], job['department'], job['location'], job['link']) for job in found]
+    
+    expected = list(legacy_iter_api_jobs(api_config, jobs))
+    assert as_rows(monitor.iter_api_jobs(api_config, jobs)) == expected
+    assert len(expected) == len(jobs) // 20
+    report("API pushdown (100,000 jobs)", best_of(lambda: list(legacy_iter_api_jobs(api_config, jobs)), repeat=3),
+           best_of(lambda: list(monitor.iter_api_jobs(api_config, jobs)), repeat=3))
+    
+    cards = ''.join(
+        f'<div class="job-card"><h3 class="job-title">Job {i}</h3>'
+        f'<span class="job-dept">{PUSHDOWN_DEPARTMENTS[i % len(PUSHDOWN_DEPARTMENTS)]}</span>'
+        f'<a class="job-link" href="/jobs/{i}">Apply</a></div>'
+        for i in range(2_000)
+    )
+    html = f'<html><body><main>{cards}</main></body></html>'
+    
+    def pushdown():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return monitor.extract_jobs_from_html_text(html_config, html)
+    
+    for name, backend in HTML_PARSERS.items():
+        if backend is None:
+            continue
+        html_config['html_parser'] = name
+        assert as_rows(pushdown()) == legacy_extract_html_jobs(backend, html_config, html)
+        report(f"HTML pushdown, {name} (2,000 jobs)",
+               best_of(lambda: legacy_extract_html_jobs(backend, html_config, html), repeat=3),
+               best_of(pushdown, repeat=3))
+
+
+def make_board_jobs(company, count):
+    """Jobs as a fetcher returns them for one board"""
+    return [
+        {
+            'company': company,
+            'title': f"Senior Software Engineer {i}",
+            'department': 'Engineering',
+            'location': 'Dubai, United Arab Emirates',
+            'link': f"https://boards.greenhouse.io/{company}/jobs/{i}",
+            'found_date': '2026-05-18 09:37:10'
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_merge(monitor, jobs_by_id):
+    """Fetch every board into one results list, then merge into all_current_jobs"""
+    results = [monitor.fetch_jobs(company) for company in monitor.config['companies']]
+    current_run_job_ids = set()
+    all_current_jobs = []
+    for current_jobs in results:
+        for job in current_jobs:
+            job_id = monitor.get_job_id(job)
+            current_run_job_ids.add(job_id)
+            existing_job = jobs_by_id[job_id]
+            existing_job['last_seen'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            existing_job['is_active'] = True
+            existing_job['is_new'] = monitor.is_job_new(existing_job['found_date'])
+            all_current_jobs.append(existing_job)
+    return all_current_jobs
+
+
+def streaming_merge(monitor, jobs_by_id):
+    """Merge boards through the fetch -> diff pipeline"""
+    changes = monitor.iter_job_changes(monitor.iter_fetched_boards(), jobs_by_id, set(), set())
+    for change, job in changes:
+        pass
+
+
+def bench_pipeline():
+    """Peak memory of fetching and merging boards whose jobs are all already tracked"""
+    monitor = JobMonitor(config_file='')
+    monitor.fetch_jobs = lambda company: make_board_jobs(company['name'], 500)
+    
+    for board_count in (10, 50, 100):
+        monitor.config = {
+            'companies': [{'name': f"company-{i}"} for i in range(board_count)],
+            'max_concurrency': 4
+        }
+        jobs_by_id = {}
+        for company in monitor.config['companies']:
+            for job in make_board_jobs(company['name'], 500):
+                jobs_by_id[monitor.get_job_id(job)] = dict(job, id=monitor.get_job_id(job))
+        
+        legacy = peak_memory(lambda: legacy_merge(monitor, jobs_by_id))
+        streaming = peak_memory(lambda: streaming_merge(monitor, jobs_by_id))
+        print(f"{f'merge peak memory ({board_count} boards)':<40} {legacy / 1024 ** 2:9.1f} MB -> {streaming / 1024 ** 2:9.1f} MB")
+
+
+def row_iter_api_jobs(company_config, jobs_data):
+    """API extraction filtering one job at a time (filter fields first)"""
+    title_field = compile_field_path(company_config['api_title_field'])
+    department_field = compile_field_path(company_config['api_department_field'])
+    location_field = compile_field_path(company_config['api_location_field'])
+    link_field = compile_field_path(company_config['api_link_field'])
+    job_filter = JobFilter(company_config)
+    base = company_config['api_url'].split('/api')[0].rstrip('/')
+    
+    for job_data in jobs_data:
+        department = department_field.get(job_data)
+        if not job_filter.department.matches(department):
+            continue
+        location = location_field.get(job_data)
+        if not job_filter.location.matches(location):
+            continue
+        
+        title = title_field.get(job_data)
+        link = link_field.get(job_data)
+        if link and not link.startswith('http'):
+            link = base + '/' + link.lstrip('/')
+        
+        yield {
+            'company': company_config['name'],
+            'title': str(title),
+            'department': str(department),
+            'location': str(location),
+            'link': link,
+            'found_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+
+def bench_batch_filters():
+    """Row-at-a-time filtering vs column batches with a selection mask"""
+    monitor = JobMonitor(config_file='')
+    config = dict(PUSHDOWN_CONFIG, departments=['Engineering', 'Data'], locations=['Dubai'])
+    job_filter = JobFilter(config)
+    
+    for count in (1_000, 10_000, 100_000):
+        jobs = make_api_jobs(count)
+        departments = [job['metadata'][4]['value'] for job in jobs]
+        locations = [job['location']['name'] for job in jobs]
+        
+        rows = lambda: [job_filter.matches(department, location) for department, location in zip(departments, locations)]
+        assert job_filter.select(departments, locations) == rows()
+        report(f"filter mask ({count:,} jobs)", best_of(rows), best_of(lambda: job_filter.select(departments, locations)))
+        
+        without_dates = lambda found: [{k: v for k, v in job.items() if k != 'found_date'} for job in found]
+        assert without_dates(monitor.iter_api_jobs(config, jobs)) == without_dates(row_iter_api_jobs(config, jobs))
+        report(f"API extraction ({count:,} jobs)", best_of(lambda: list(row_iter_api_jobs(config, jobs))),
+               best_of(lambda: list(monitor.iter_api_jobs(config, jobs))))
+
+
+def bench_storage():
+    """Saving 100k tracked jobs after a run that touched 1% of them (in 3 of 300 companies), per backend"""
+    data = make_tracked_jobs(100_000)
+    # Fields a job doesn't have must load back missing, not as None
+    del data['jobs'][1]['location'], data['jobs'][1]['link']
+    
+    with tempfile.TemporaryDirectory() as directory:
+        json_storage = JsonStorage(os.path.join(directory, 'tracked_jobs.json'))
+        sqlite_path = os.path.join(directory, 'tracked_jobs.db')
+        log_path = os.path.join(directory, 'tracked_jobs.events.ndjson')
+        snapshot_path = os.path.join(directory, 'tracked_jobs.snapshot.json')
+        backends = {
+            'SQLite': lambda: SqliteStorage(sqlite_path, export_path=None),
+            'event log': lambda: EventLogStorage(log_path, snapshot_path, export_path=None),
+            'shards': lambda: ShardedStorage(os.path.join(directory, 'tracked_jobs'), export_path=None),
+            'binary': lambda: BinaryStorage(os.path.join(directory, 'tracked_jobs.jobsnap'), export_path=None),
+        }
+        
+        json_storage.save(data)
+        runs = iter(range(1_000_000))
+        
+        def touch(loaded):
+            run = next(runs)
+            for job in loaded['jobs'][::100]:
+                job['last_seen'] = f"run {run}"
+        
+        def timed_saves(storage):
+            # Jobs as the monitor gets them, tracking their own changes
+            loaded = storage.load()
+            assert list(loaded['jobs']) == data['jobs']
+            
+            def save():
+                touch(loaded)
+                storage.save(loaded)
+            
+            return best_of(save, repeat=3), loaded
+        
+        json_save, _ = timed_saves(json_storage)
+        json_load = best_of(json_storage.load, repeat=3)
+        
+        for label, open_storage in backends.items():
+            open_storage().save(data)
+            save_time, saved = timed_saves(open_storage())
+            report(f"save, 1% changed, {label}", json_save, save_time)
+            assert list(open_storage().load()['jobs']) == list(saved['jobs'])
+            report(f"load, {label}", json_load, best_of(lambda: open_storage().load(), repeat=3))
+
+
+def bench_binary_snapshot():
+    """Startup load of 100k tracked jobs, tracked_jobs.json vs the lazily read binary snapshot"""
+    data = make_tracked_jobs(100_000)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'tracked_jobs.json')
+        json_storage = JsonStorage(json_path)
+        binary_storage = BinaryStorage(os.path.join(directory, 'tracked_jobs.jobsnap'), export_path=None)
+        json_storage.save(data)
+        binary_storage.save(data)
+        
+        report("startup load (100,000 jobs)", best_of(json_storage.load, repeat=3),
+               best_of(lambda: BinaryStorage(binary_storage.path, export_path=None).load(), repeat=3))
+        report("load and decode every job", best_of(json_storage.load, repeat=3),
+               best_of(lambda: list(BinaryStorage(binary_storage.path, export_path=None).load()['jobs']), repeat=3))
+        print(f"{'file size':<40} {os.path.getsize(json_path):>12,} B -> {os.path.getsize(binary_storage.path):>12,} B")
+
+
+BENCHMARKS = {
+    'field_paths': bench_field_paths,
+    'json_codec': bench_json_codec,
+    'filters': bench_filters,
+    'filter_pushdown': bench_filter_pushdown,
+    'batch_filters': bench_batch_filters,
+    'html_parsers': bench_html_parsers,
+    'container_selector': bench_container_selector,
+    'pipeline': bench_pipeline,
+    'storage': bench_storage,
+    'binary_snapshot': bench_binary_snapshot,
+}
+
+
+def main():
+    """Main entry point"""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
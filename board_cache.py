@@ -0,0 +1,194 @@
+"""
+Persistent per-board fetch cache.
+
+Remembers the HTTP validators (ETag / Last-Modified) and a hash of the
+body a board sent on the previous run, together with the jobs extracted
+from that response. An unchanged board - answered with a 304, or with the
+same body bytes - can then skip parsing and filtering entirely.
+
+Also keeps a circuit breaker per board: boards that fail several runs in a
+row (or run past the deadline) are skipped until a cool-down passes, and
+the queue of boards deferred by the previous run's deadline.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import json_codec
+
+
+def get_body_hash(body):
+    """Hash a raw response body"""
+    return hashlib.sha256(body).hexdigest()
+
+
+def get_config_fingerprint(company_config):
+    """Hash a company config so cached jobs are dropped when filters change"""
+    config_string = json.dumps(company_config, sort_keys=True)
+    return hashlib.md5(config_string.encode()).hexdigest()
+
+
+class BoardCache:
+    def __init__(self, cache_file='fetch_cache.json', failure_threshold=3, cooldown_hours=24):
+        """Initialize the board cache"""
+        self.cache_file = cache_file
+        self.failure_threshold = failure_threshold
+        self.cooldown = timedelta(hours=cooldown_hours)
+        data = self.load()
+        self.entries = data.get('boards', {})
+        self.breakers = data.get('breakers', {})
+        self.deferred = data.get('deferred', [])
+        # Set once the run stops waiting for fetches; late results are dropped
+        self.frozen = False
+        self.lock = threading.Lock()
+    
+    def load(self):
+        """Load cache entries from disk"""
+        if not os.path.exists(self.cache_file):
+            return {}
+        
+        try:
+            with open(self.cache_file, 'rb') as f:
+                return json_codec.loads(f.read())
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable fetch cache: {e}")
+            return {}
+    
+    def save(self, keys=None):
+        """Save cache entries, keeping only the given board keys if provided"""
+        with self.lock:
+            if keys is not None:
+                self.entries = {key: entry for key, entry in self.entries.items() if key in keys}
+                self.breakers = {key: state for key, state in self.breakers.items() if key in keys}
+                self.deferred = [key for key in self.deferred if key in keys]
+            data = {
+                "boards": dict(self.entries),
+                "breakers": {key: dict(state) for key, state in self.breakers.items()},
+                "deferred": list(self.deferred)
+            }
+        
+        try:
+            json_codec.write_pretty(data, self.cache_file)
+        except Exception as e:
+            print(f"❌ Error saving fetch cache: {e}")
+    
+    def get_entry(self, key, company_config):
+        """Return the cache entry for a board if it was built from the same config"""
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and entry.get('config') == get_config_fingerprint(company_config):
+            return entry
+        return None
+    
+    def conditional_headers(self, key, company_config, headers):
+        """Add If-None-Match / If-Modified-Since to the request headers"""
+        entry = self.get_entry(key, company_config)
+        if not entry:
+            return headers
+        
+        headers = dict(headers)
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def cached_jobs(self, key, company_config, body_hash=None):
+        """Return the jobs extracted on the previous run, or None
+        
+        When body_hash is given, the jobs are only returned if the previous
+        response body hashed to the same value.
+        """
+        entry = self.get_entry(key, company_config)
+        if entry is None or 'jobs' not in entry:
+            return None
+        if body_hash is not None and entry.get('body_hash') != body_hash:
+            return None
+        
+        found_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return [{**job, 'found_date': found_date} for job in entry['jobs']]
+    
+    def store(self, key, company_config, response_headers, body_hash, jobs, truncated=None):
+        """Remember the validators, body hash and extracted jobs of a fresh response
+        
+        truncated describes why only part of the board was read, if it was.
+        """
+        entry = {
+            'config': get_config_fingerprint(company_config),
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'body_hash': body_hash,
+            'jobs': [{k: v for k, v in job.items() if k != 'found_date'} for job in jobs]
+        }
+        if truncated:
+            entry['truncated'] = truncated
+        with self.lock:
+            if not self.frozen:
+                self.entries[key] = entry
+    
+    def get_truncation(self, key, company_config):
+        """Why the cached jobs cover only part of the board, or None"""
+        entry = self.get_entry(key, company_config)
+        return entry.get('truncated') if entry else None
+    
+    def get_open_until(self, key):
+        """Return when the board's circuit closes again if it is open, else None"""
+        with self.lock:
+            state = self.breakers.get(key)
+        if not state or not state.get('open_until'):
+            return None
+        
+        open_until = datetime.strptime(state['open_until'], '%Y-%m-%d %H:%M:%S')
+        return open_until if open_until > datetime.now() else None
+    
+    def record_success(self, key):
+        """Close the board's circuit after a successful fetch"""
+        with self.lock:
+            if not self.frozen:
+                self.breakers.pop(key, None)
+    
+    def record_failure(self, key):
+        """Count a failed fetch and open the circuit once the threshold is hit
+        
+        Returns the number of failures in a row, or None once frozen.
+        """
+        with self.lock:
+            if self.frozen:
+                return None
+            return self.count_failure(key)
+    
+    def record_overrun(self, key):
+        """Count a fetch still running at the run deadline as a failure
+        
+        Recorded by the run itself, so it counts even once frozen. Returns
+        the number of failures in a row.
+        """
+        with self.lock:
+            return self.count_failure(key)
+    
+    def count_failure(self, key):
+        """Add a failure to the board's breaker, opening it at the threshold; call with the lock held"""
+        state = self.breakers.setdefault(key, {'failures': 0, 'open_until': None})
+        state['failures'] += 1
+        if state['failures'] >= self.failure_threshold:
+            open_until = datetime.now() + self.cooldown
+            state['open_until'] = open_until.strftime('%Y-%m-%d %H:%M:%S')
+        return state['failures']
+    
+    def freeze(self, frozen=True):
+        """Stop (or resume) recording fetch results, e.g. from boards abandoned at the deadline"""
+        with self.lock:
+            self.frozen = frozen
+    
+    def get_deferred(self):
+        """Board keys deferred by the previous run, in queue order"""
+        with self.lock:
+            return list(self.deferred)
+    
+    def set_deferred(self, keys):
+        """Remember the boards this run deferred, in the order the next run should fetch them"""
+        with self.lock:
+            self.deferred = list(keys)
@@ -10,8 +10,27 @@ Usage:
 import requests
 from bs4 import BeautifulSoup
 import json
+import os
 import sys
 
+from http_client import RateLimiter, create_session
+
+
+def load_rate_limiter(config_file='job_config.json'):
+    """Use the monitor's per-host rate limits when its config is available"""
+    if not os.path.exists(config_file):
+        return RateLimiter()
+    
+    try:
+        with open(config_file, 'r') as f:
+            return RateLimiter.from_config(json.load(f))
+    except Exception:
+        return RateLimiter()
+
+
+SESSION = create_session()
+RATE_LIMITER = load_rate_limiter()
+
 
 def find_api_endpoint(career_url):
     """Try to find the API endpoint for a career page"""
@@ -23,7 +42,7 @@ def find_api_endpoint(career_url):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(career_url, headers=headers, timeout=10)
+        response = RATE_LIMITER.get(SESSION, career_url, headers=headers, timeout=10)
         content = response.text.lower()
         
         # Check for known platforms
@@ -132,7 +151,7 @@ def test_api_endpoint(api_url):
             'Accept': 'application/json',
         }
         
-        response = requests.get(api_url, headers=headers, timeout=15)
+        response = RATE_LIMITER.get(SESSION, api_url, headers=headers, timeout=15)
         response.raise_for_status()
         
         data = response.json()
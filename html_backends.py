@@ -0,0 +1,188 @@
+"""
+HTML parser backends for career pages without an API.
+
+Every backend parses a page and answers the same four questions for the
+monitor: which elements match job_selector, the first match of a field
+selector inside a job element, an element's text and an attribute value.
+The backend is picked per company with the 'html_parser' option:
+
+    html.parser  BeautifulSoup with the pure-Python parser (always available)
+    lxml         lxml.html with compiled cssselect selectors
+    selectolax   selectolax's lexbor (or modest) engine
+
+When the requested backend isn't installed the next one in HTML_PARSERS
+is used, ending with html.parser.
+
+Script and style contents are dropped before parsing, and an optional
+'container_selector' limits the work to the element holding the job
+listings. With html.parser a simple container selector (tag, #id,
+.class) becomes a SoupStrainer, so nothing outside the container is
+turned into tree nodes at all.
+"""
+
+import re
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from cssselect import HTMLTranslator
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+DEFAULT_HTML_PARSER = 'html.parser'
+
+# Raw-text elements end at their first closing tag, just like in the
+# HTML tokenizer. The empty element is kept so surrounding text nodes
+# aren't merged
+RAW_TEXT_RE = re.compile(r'<(script|style)(?=[\s/>])[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+SIMPLE_SELECTOR_RE = re.compile(r'([a-zA-Z][\w-]*)?(?:#([\w-]+))?(?:\.([\w-]+))?')
+
+
+def strip_raw_text(html):
+    """Drop script and style contents, which never hold job listings"""
+    return RAW_TEXT_RE.sub(r'<\1></\1>', html)
+
+
+@lru_cache(maxsize=256)
+def get_soup_strainer(selector):
+    """Turn a simple tag#id.class selector into a SoupStrainer, or None"""
+    match = SIMPLE_SELECTOR_RE.fullmatch(selector.strip())
+    if not match or not any(match.groups()):
+        return None
+    
+    name, element_id, class_name = match.groups()
+    attrs = {}
+    if element_id:
+        attrs['id'] = element_id
+    if class_name:
+        attrs['class'] = class_name
+    return SoupStrainer(name, attrs)
+
+
+class HtmlBackend:
+    name = None
+    
+    def parse(self, html, container_selector=None):
+        """Parse a page and return the node to search for jobs, or None"""
+        document = self.parse_document(strip_raw_text(html))
+        if not container_selector:
+            return document
+        return self.select_one(document, container_selector)
+
+
+class SoupBackend(HtmlBackend):
+    name = 'html.parser'
+    
+    def parse(self, html, container_selector=None):
+        strainer = get_soup_strainer(container_selector) if container_selector else None
+        if strainer is None:
+            return super().parse(html, container_selector)
+        
+        soup = BeautifulSoup(strip_raw_text(html), 'html.parser', parse_only=strainer)
+        return soup.select_one(container_selector)
+    
+    def parse_document(self, html):
+        return BeautifulSoup(html, 'html.parser')
+    
+    def select(self, node, selector):
+        return node.select(selector)
+    
+    def select_one(self, node, selector):
+        return node.select_one(selector)
+    
+    def get_text(self, node):
+        return node.get_text(strip=True)
+    
+    def get_attr(self, node, name, default=''):
+        return node.get(name, default)
+
+
+@lru_cache(maxsize=256)
+def compile_lxml_selector(selector):
+    """Compile a CSS selector to an XPath matching descendants of a node"""
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix='descendant::'))
+
+
+class LxmlBackend(HtmlBackend):
+    name = 'lxml'
+    
+    def parse_document(self, html):
+        if not html.strip():
+            html = '<html></html>'
+        # lxml refuses str input that carries an XML encoding declaration
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=parser)
+    
+    def select(self, node, selector):
+        return compile_lxml_selector(selector)(node)
+    
+    def select_one(self, node, selector):
+        matches = compile_lxml_selector(selector)(node)
+        return matches[0] if matches else None
+    
+    def get_text(self, node):
+        return ''.join(text.strip() for text in node.itertext())
+    
+    def get_attr(self, node, name, default=''):
+        return node.get(name, default)
+
+
+class SelectolaxBackend(HtmlBackend):
+    name = 'selectolax'
+    
+    def parse_document(self, html):
+        return SelectolaxParser(html).root
+    
+    def select(self, node, selector):
+        # selectolax matches the node itself too, soupsieve only descendants
+        return [match for match in node.css(selector) if match.mem_id != node.mem_id]
+    
+    def select_one(self, node, selector):
+        for match in node.css(selector):
+            if match.mem_id != node.mem_id:
+                return match
+        return None
+    
+    def get_text(self, node):
+        return node.text(deep=True, separator='', strip=True)
+    
+    def get_attr(self, node, name, default=''):
+        value = node.attributes.get(name, default)
+        return default if value is None else value
+
+
+# Fastest first; a missing backend falls back to the ones after it
+HTML_PARSERS = {
+    'selectolax': SelectolaxBackend() if SelectolaxParser else None,
+    'lxml': LxmlBackend() if lxml else None,
+    'html.parser': SoupBackend(),
+}
+
+
+@lru_cache(maxsize=None)
+def get_html_backend(name=None):
+    """Return the requested backend, or the next installed one"""
+    name = name or DEFAULT_HTML_PARSER
+    names = list(HTML_PARSERS)
+    
+    if name not in HTML_PARSERS:
+        print(f"⚠️ Unknown html_parser '{name}', using {DEFAULT_HTML_PARSER}")
+        return HTML_PARSERS[DEFAULT_HTML_PARSER]
+    
+    for candidate in names[names.index(name):]:
+        backend = HTML_PARSERS[candidate]
+        if backend:
+            if candidate != name:
+                print(f"⚠️ html_parser '{name}' is not installed, using {candidate}")
+            return backend
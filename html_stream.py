@@ -0,0 +1,141 @@
+"""
+Early-terminating reader for huge HTML career pages.
+
+HtmlPrefixReader is a streaming consumer for http_client: it keeps the
+decompressed bytes of a page and scans its tags as they arrive, counting
+complete job elements. Once max_jobs of them have been seen, or max_bytes
+have been read, it reports done and the rest of the page is never
+downloaded. The body is then cut right after the last complete job
+element, so a half-downloaded listing can never turn into a bogus job.
+
+Job elements are recognised by the last part of job_selector, which has
+to be a simple tag, #id or .class selector (e.g. 'li.job' in
+'ul.openings > li.job').
+"""
+
+import re
+
+# A comment opening, or a start or end tag whose quoted attribute values may contain '>'
+TAG_RE = re.compile(rb'''<!--|<(/?)([a-zA-Z][\w:-]*)((?:[^>"']|"[^"]*"|'[^']*')*)>''')
+ATTR_RE = re.compile(rb'''([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''')
+SIMPLE_PART_RE = re.compile(r'([a-zA-Z][\w-]*)?((?:[#.][\w-]+)*)')
+COMMENT_END_RE = re.compile(rb'-->')
+RAW_TEXT_END_RES = {
+    name: re.compile(rb'</' + name + rb'[\s/>]', re.IGNORECASE) for name in (b'script', b'style')
+}
+
+
+def parse_job_element_selector(job_selector):
+    """Split the last part of job_selector into (tag, id, classes), or None"""
+    last_part = re.split(r'[\s>+~]+', job_selector.strip())[-1]
+    match = SIMPLE_PART_RE.fullmatch(last_part)
+    if not last_part or not match:
+        return None
+    
+    tag, rest = match.groups()
+    element_id = None
+    classes = set()
+    for marker, value in re.findall(r'([#.])([\w-]+)', rest):
+        if marker == '#':
+            element_id = value.encode()
+        else:
+            classes.add(value.encode())
+    return (tag.lower().encode() if tag else None), element_id, frozenset(classes)
+
+
+class HtmlPrefixReader:
+    def __init__(self, job_selector, max_jobs=None, max_bytes=None):
+        """Stop after max_jobs complete job elements or max_bytes of body"""
+        self.selector = parse_job_element_selector(job_selector)
+        self.max_jobs = max_jobs
+        self.max_bytes = max_bytes
+        self.buffer = bytearray()
+        self.scan_pos = 0
+        self.job_tag = None
+        self.depth = 0
+        self.job_count = 0
+        self.cut = 0
+        self.done = False
+        self.truncated = None
+        self.body = b''
+    
+    def is_job_element(self, name, attrs):
+        tag, element_id, classes = self.selector
+        if tag and name != tag:
+            return False
+        if not element_id and not classes:
+            return True
+        
+        values = {}
+        for key, *value in ATTR_RE.findall(attrs):
+            values[key.lower()] = b''.join(value)
+        if element_id and values.get(b'id') != element_id:
+            return False
+        return classes <= set(values.get(b'class', b'').split())
+    
+    def scan(self, end):
+        """Count job elements in complete tags before end"""
+        pos = self.scan_pos
+        while not self.done:
+            match = TAG_RE.search(self.buffer, pos, end)
+            if not match:
+                break
+            
+            closing, name, attrs = match.groups()
+            if name is None or (not closing and name.lower() in RAW_TEXT_END_RES):
+                # Comments, scripts and styles may contain tag-like text
+                end_re = COMMENT_END_RE if name is None else RAW_TEXT_END_RES[name.lower()]
+                end_match = end_re.search(self.buffer, match.end(), end)
+                if not end_match:
+                    # Wait for the rest of it
+                    pos = match.start()
+                    break
+                pos = end_match.end()
+                continue
+            
+            pos = match.end()
+            name = name.lower()
+            
+            if self.job_tag is None:
+                if not closing and self.is_job_element(name, attrs) and not attrs.endswith(b'/'):
+                    self.job_tag = name
+                    self.depth = 1
+            elif name == self.job_tag:
+                if closing:
+                    self.depth -= 1
+                elif not attrs.endswith(b'/'):
+                    self.depth += 1
+                
+                if self.depth == 0:
+                    self.job_tag = None
+                    self.job_count += 1
+                    self.cut = match.end()
+                    if self.max_jobs and self.job_count >= self.max_jobs:
+                        self.done = True
+                        self.truncated = f"stopped after {self.job_count} job listings"
+        
+        self.scan_pos = pos
+    
+    def feed(self, data):
+        if self.done:
+            return
+        self.buffer += data
+        
+        if self.max_bytes and len(self.buffer) >= self.max_bytes:
+            # Nothing past the limit is looked at, however the chunks fell
+            self.scan(self.max_bytes)
+            if not self.done:
+                self.done = True
+                self.truncated = f"stopped at the {self.max_bytes:,} byte limit"
+            return
+        
+        # A tag can't be complete past the last '<'
+        self.scan(max(0, self.buffer.rfind(b'<')))
+    
+    def close(self):
+        if self.truncated:
+            self.body = bytes(self.buffer[:self.cut])
+        else:
+            self.body = bytes(self.buffer)
+        self.buffer = bytearray()
+        return self
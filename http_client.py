@@ -0,0 +1,582 @@
+"""
+Shared HTTP helpers for the job monitor.
+
+Keeps a single keep-alive session per run so boards hosted on the same
+domain (boards-api.greenhouse.io, api.lever.co, ...) reuse TCP+TLS
+connections instead of handshaking for every request, rate limits
+requests per host so parallel fetches don't trip 429s, and retries
+transient failures with jittered exponential backoff.
+
+Bodies are requested compressed and decompressed as they stream in, and
+every response is returned as an HttpResponse that records both the bytes
+on the wire and the decompressed size.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+import json_codec
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+CHUNK_SIZE = 64 * 1024
+# Longest Retry-After honored before a throttled board is given up on
+DEFAULT_MAX_RETRY_AFTER_SECONDS = 60.0
+# First wait after a 429/503 without Retry-After, doubled on every retry
+THROTTLE_BACKOFF_BASE = 1.0
+
+ACCEPT_ENCODING = ', '.join(
+    ['gzip', 'deflate'] + (['br'] if brotli else []) + (['zstd'] if zstandard else [])
+)
+
+
+def get_pool_settings(config):
+    """Read connection pool sizes from the monitoring config"""
+    pool_config = config.get('http_pool', {})
+    max_concurrency = max(1, int(config.get('max_concurrency', 1)))
+    
+    pool_connections = int(pool_config.get('pool_connections', DEFAULT_POOL_CONNECTIONS))
+    # Never allow fewer connections per host than parallel workers, otherwise
+    # urllib3 discards the extra connections and we handshake again
+    pool_maxsize = int(pool_config.get('pool_maxsize', max(DEFAULT_POOL_MAXSIZE, max_concurrency)))
+    
+    return pool_connections, pool_maxsize
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+    """Create a pooled keep-alive session
+    
+    pool_connections is the number of hosts whose pools are kept open,
+    pool_maxsize is the number of connections kept per host.
+    """
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class ZlibDecoder:
+    """Streaming gzip/deflate decoder (handles multi-member gzip and raw deflate)"""
+    
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.wbits = 16 + zlib.MAX_WBITS if encoding == 'gzip' else zlib.MAX_WBITS
+        self.decompressor = zlib.decompressobj(self.wbits)
+        self.started = False
+    
+    def decompress(self, data):
+        try:
+            output = self.decompressor.decompress(data)
+        except zlib.error:
+            if self.encoding != 'deflate' or self.started:
+                raise
+            # Some servers send raw deflate without the zlib header
+            self.wbits = -zlib.MAX_WBITS
+            self.decompressor = zlib.decompressobj(self.wbits)
+            output = self.decompressor.decompress(data)
+        self.started = True
+        
+        while self.decompressor.unused_data:
+            remaining = self.decompressor.unused_data
+            self.decompressor = zlib.decompressobj(self.wbits)
+            output += self.decompressor.decompress(remaining)
+        return output
+    
+    def flush(self):
+        return self.decompressor.flush()
+
+
+class BrotliDecoder:
+    """Streaming brotli decoder"""
+    
+    def __init__(self):
+        self.decompressor = brotli.Decompressor()
+    
+    def decompress(self, data):
+        if hasattr(self.decompressor, 'process'):
+            return self.decompressor.process(data)
+        return self.decompressor.decompress(data)
+    
+    def flush(self):
+        return b''
+
+
+class ZstdDecoder:
+    """Streaming zstd decoder"""
+    
+    def __init__(self):
+        self.decompressor = zstandard.ZstdDecompressor().decompressobj()
+    
+    def decompress(self, data):
+        return self.decompressor.decompress(data)
+    
+    def flush(self):
+        return b''
+
+
+class StreamDecoder:
+    """Decode a (possibly multi-layer) Content-Encoding chunk by chunk"""
+    
+    def __init__(self, content_encoding):
+        encodings = [e.strip().lower() for e in (content_encoding or '').split(',') if e.strip()]
+        # Encodings are listed in the order they were applied, so undo them in reverse
+        self.decoders = [self.create_decoder(e) for e in reversed(encodings) if e != 'identity']
+    
+    def create_decoder(self, encoding):
+        if encoding in ('gzip', 'x-gzip'):
+            return ZlibDecoder('gzip')
+        if encoding == 'deflate':
+            return ZlibDecoder('deflate')
+        if encoding == 'br' and brotli:
+            return BrotliDecoder()
+        if encoding == 'zstd' and zstandard:
+            return ZstdDecoder()
+        raise ValueError(f"unsupported Content-Encoding: {encoding}")
+    
+    def decompress(self, data):
+        for decoder in self.decoders:
+            data = decoder.decompress(data)
+        return data
+    
+    def flush(self):
+        data = b''
+        for decoder in self.decoders:
+            data = decoder.decompress(data) + decoder.flush()
+        return data
+
+
+def decode_text(body, headers):
+    """Decode a body the same way requests does"""
+    encoding = requests.utils.get_encoding_from_headers(headers)
+    if encoding is None:
+        encoding = requests.compat.chardet.detect(body)['encoding'] or 'utf-8'
+    return body.decode(encoding, errors='replace')
+
+
+class HttpResponse:
+    """A fully read response, shared by the threads and asyncio engines
+    
+    When the body was handed to a streaming consumer, body is empty and
+    consumed holds what the consumer returned; body_size and body_hash still
+    describe the decompressed body.
+    """
+    
+    def __init__(self, url, status_code, headers, body, wire_bytes, body_size=None, body_hash=None, consumed=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.wire_bytes = wire_bytes
+        self.body_size = len(body) if body_size is None else body_size
+        self.body_hash = body_hash
+        self.consumed = consumed
+    
+    @property
+    def content_encoding(self):
+        return self.headers.get('Content-Encoding') or 'identity'
+    
+    @property
+    def text(self):
+        return decode_text(self.body, self.headers)
+    
+    def json(self):
+        return json_codec.loads(self.body)
+    
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} {kind} Error for url: {self.url}", response=self
+            )
+
+
+class BodyReader:
+    """Decompress a body chunk by chunk, buffering it or feeding a streaming consumer
+    
+    A consumer has feed(bytes) and close(); close() returns the parsed result.
+    A consumer that sets done to True has seen enough, and the rest of the
+    body is not downloaded.
+    """
+    
+    def __init__(self, content_encoding, consumer=None):
+        self.decoder = StreamDecoder(content_encoding)
+        self.consumer = consumer
+        self.hasher = hashlib.sha256() if consumer else None
+        self.chunks = []
+        self.wire_bytes = 0
+        self.body_size = 0
+    
+    def add(self, chunk):
+        self.wire_bytes += len(chunk)
+        self.write(self.decoder.decompress(chunk))
+    
+    def write(self, data):
+        self.body_size += len(data)
+        if self.consumer:
+            self.hasher.update(data)
+            self.consumer.feed(data)
+        else:
+            self.chunks.append(data)
+    
+    @property
+    def done(self):
+        return self.consumer is not None and getattr(self.consumer, 'done', False)
+    
+    def finish(self, url, status_code, headers):
+        if not self.done:
+            self.write(self.decoder.flush())
+        if not self.consumer:
+            return HttpResponse(url, status_code, headers, b''.join(self.chunks), self.wire_bytes)
+        
+        return HttpResponse(
+            url, status_code, headers, b'', self.wire_bytes,
+            body_size=self.body_size, body_hash=self.hasher.hexdigest(), consumed=self.consumer.close()
+        )
+
+
+def create_consumer(consume, status_code):
+    """Only successful bodies go to the streaming consumer"""
+    return consume() if consume and 200 <= status_code < 300 else None
+
+
+class FetchCancelled(requests.exceptions.RequestException):
+    """The run gave up on the fetch, e.g. because its time budget ran out"""
+
+
+def check_cancelled(cancel):
+    if cancel is not None and cancel.is_set():
+        raise FetchCancelled("cancelled: the run's time budget ran out")
+
+
+def sleep(seconds, cancel=None):
+    """time.sleep that stops early with FetchCancelled once the cancel event is set"""
+    if cancel is None:
+        time.sleep(seconds)
+    elif cancel.wait(seconds):
+        check_cancelled(cancel)
+
+
+def iter_raw_chunks(raw):
+    """Yield a urllib3 body as it arrives, still compressed
+    
+    urllib3 2's read1() returns whatever has arrived instead of waiting
+    for a full CHUNK_SIZE, so a slow body can be cancelled promptly.
+    """
+    if not hasattr(raw, 'read1'):
+        yield from raw.stream(CHUNK_SIZE, decode_content=False)
+        return
+    
+    while True:
+        chunk = raw.read1(CHUNK_SIZE, decode_content=False)
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_response(response, consume=None, cancel=None):
+    """Stream and decompress a requests response (sent with stream=True)
+    
+    consume is an optional factory returning a fresh streaming consumer.
+    Reading stops with FetchCancelled between chunks once cancel is set.
+    """
+    reader = BodyReader(response.headers.get('Content-Encoding'), create_consumer(consume, response.status_code))
+    
+    try:
+        for chunk in iter_raw_chunks(response.raw):
+            check_cancelled(cancel)
+            reader.add(chunk)
+            if reader.done:
+                break
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+    except (urllib3.exceptions.ProtocolError, urllib3.exceptions.SSLError) as e:
+        # Match requests' own handling so a connection dropped mid-body is retried
+        raise requests.exceptions.ChunkedEncodingError(e)
+    finally:
+        response.close()
+    
+    return reader.finish(response.url, response.status_code, response.headers)
+
+
+async def read_response_async(response, consume=None):
+    """Stream and decompress an aiohttp response (session with auto_decompress=False)"""
+    reader = BodyReader(response.headers.get('Content-Encoding'), create_consumer(consume, response.status))
+    
+    try:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            reader.add(chunk)
+            if reader.done:
+                # Drop the connection rather than reading the rest of the body
+                response.close()
+                break
+    finally:
+        response.release()
+    
+    return reader.finish(str(response.url), response.status, response.headers)
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait"""
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class ThrottledError(requests.exceptions.RequestException):
+    """A host asked to be left alone for longer than max_retry_after_seconds"""
+
+
+class HostLimit:
+    """Token bucket and Retry-After state for a single host"""
+    
+    def __init__(self, requests_per_second=None, max_in_flight=None):
+        self.requests_per_second = requests_per_second
+        self.max_in_flight = max_in_flight
+        self.next_slot = 0.0
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.thread_semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self.async_semaphore = None
+        self.async_loop = None
+    
+    def reserve(self):
+        """Reserve the next request slot and return how long to wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.blocked_until)
+            if self.requests_per_second:
+                start = max(start, self.next_slot)
+                self.next_slot = start + 1.0 / self.requests_per_second
+            return start - now
+    
+    def block_for(self, seconds):
+        """Hold back every request to this host for the given number of seconds"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """Per-host request rate and concurrency limits shared by every fetch
+    
+    Limits are read from the 'rate_limits' config block, keyed by host name
+    with an optional 'default' entry, e.g.
+    {"default": {"requests_per_second": 5, "max_in_flight": 4}}.
+    Hosts without limits are not throttled, but 429 and 503 responses always
+    are: they are retried up to max_retry_after times, after the Retry-After
+    delay or an exponential backoff when there is none. A Retry-After longer
+    than max_retry_after_seconds raises ThrottledError instead of waiting.
+    RetryPolicy leaves these two statuses to the rate limiter.
+    """
+    
+    def __init__(self, limits=None, max_retry_after=3, max_retry_after_seconds=DEFAULT_MAX_RETRY_AFTER_SECONDS):
+        self.limits = limits or {}
+        self.max_retry_after = max_retry_after
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self.hosts = {}
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config):
+        """Build a rate limiter from the monitoring config"""
+        return cls(
+            config.get('rate_limits', {}),
+            int(config.get('max_retry_after', 3)),
+            float(config.get('max_retry_after_seconds', DEFAULT_MAX_RETRY_AFTER_SECONDS))
+        )
+    
+    def get_host(self, url):
+        """Return the limit state for the host of a URL"""
+        host = urlsplit(url).hostname or ''
+        with self.lock:
+            if host not in self.hosts:
+                limits = self.limits.get(host, self.limits.get('default', {}))
+                self.hosts[host] = HostLimit(
+                    limits.get('requests_per_second'),
+                    limits.get('max_in_flight')
+                )
+            return self.hosts[host]
+    
+    def get_retry_delay(self, url, host_limit, status_code, headers, attempt):
+        """Return how long to back off after a throttled response, or None"""
+        if status_code not in (429, 503) or attempt >= self.max_retry_after:
+            return None
+        
+        delay = parse_retry_after(headers.get('Retry-After'))
+        if delay is None:
+            delay = THROTTLE_BACKOFF_BASE * 2 ** attempt * random.uniform(0.5, 1.0)
+        elif delay > self.max_retry_after_seconds:
+            raise ThrottledError(
+                f"{urlsplit(url).hostname} asked to retry after {delay:.0f}s, "
+                f"more than max_retry_after_seconds ({self.max_retry_after_seconds:g}s)"
+            )
+        
+        delay = min(delay, self.max_retry_after_seconds)
+        host_limit.block_for(delay)
+        return delay
+    
+    def get(self, session, url, consume=None, cancel=None, **kwargs):
+        """Perform a rate limited GET with a requests session
+        
+        The body is read inside the in-flight slot and returned as an HttpResponse.
+        Waits and the body download stop with FetchCancelled once the cancel
+        event is set.
+        """
+        host_limit = self.get_host(url)
+        
+        for attempt in range(self.max_retry_after + 1):
+            if host_limit.thread_semaphore:
+                host_limit.thread_semaphore.acquire()
+            try:
+                sleep(host_limit.reserve(), cancel)
+                response = read_response(session.get(url, stream=True, **kwargs), consume, cancel)
+            finally:
+                if host_limit.thread_semaphore:
+                    host_limit.thread_semaphore.release()
+            
+            delay = self.get_retry_delay(url, host_limit, response.status_code, response.headers, attempt)
+            if delay is None:
+                return response
+            print(f"⏳ {urlsplit(url).hostname} is throttling, retrying in {delay:.1f}s")
+        
+        return response
+    
+    async def get_async(self, session, url, consume=None, **kwargs):
+        """Perform a rate limited GET with an aiohttp session
+        
+        The body is read inside the in-flight slot and returned as an HttpResponse.
+        """
+        host_limit = self.get_host(url)
+        loop = asyncio.get_running_loop()
+        if host_limit.max_in_flight and host_limit.async_loop is not loop:
+            # asyncio semaphores are bound to the loop they are first used in
+            host_limit.async_semaphore = asyncio.Semaphore(host_limit.max_in_flight)
+            host_limit.async_loop = loop
+        
+        for attempt in range(self.max_retry_after + 1):
+            if host_limit.async_semaphore:
+                await host_limit.async_semaphore.acquire()
+            try:
+                await asyncio.sleep(host_limit.reserve())
+                response = await read_response_async(await session.get(url, **kwargs), consume)
+            finally:
+                if host_limit.async_semaphore:
+                    host_limit.async_semaphore.release()
+            
+            delay = self.get_retry_delay(url, host_limit, response.status_code, response.headers, attempt)
+            if delay is None:
+                return response
+            print(f"⏳ {urlsplit(url).hostname} is throttling, retrying in {delay:.1f}s")
+        
+        return response
+
+
+class RetryPolicy:
+    """Retry transient network errors and 5xx responses with backoff
+    
+    Read from the 'retries' config block, e.g.
+    {"max_attempts": 3, "backoff_base": 1.0, "backoff_max": 30}.
+    429 and 503 are only retried by the RateLimiter, so a throttling host
+    isn't hit by both layers.
+    """
+    
+    RETRYABLE_STATUSES = (500, 502, 504)
+    
+    def __init__(self, max_attempts=3, backoff_base=1.0, backoff_max=30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+    
+    @classmethod
+    def from_config(cls, config):
+        """Build a retry policy from the monitoring config"""
+        retry_config = config.get('retries', {})
+        return cls(
+            int(retry_config.get('max_attempts', 3)),
+            float(retry_config.get('backoff_base', 1.0)),
+            float(retry_config.get('backoff_max', 30.0))
+        )
+    
+    def get_delay(self, attempt):
+        """Full-jitter exponential backoff for the given (0-based) attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    def get(self, rate_limiter, session, url, cancel=None, **kwargs):
+        """Perform a rate limited GET, retrying transient failures until cancel is set"""
+        for attempt in range(self.max_attempts):
+            is_last = attempt + 1 == self.max_attempts
+            try:
+                response = rate_limiter.get(session, url, cancel=cancel, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                if is_last:
+                    raise
+                reason = type(e).__name__
+            else:
+                if is_last or response.status_code not in self.RETRYABLE_STATUSES:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            
+            delay = self.get_delay(attempt)
+            print(f"🔁 {reason} from {urlsplit(url).hostname}, retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 2}/{self.max_attempts})")
+            sleep(delay, cancel)
+    
+    async def get_async(self, rate_limiter, session, url, **kwargs):
+        """Perform a rate limited GET with aiohttp, retrying transient failures"""
+        for attempt in range(self.max_attempts):
+            is_last = attempt + 1 == self.max_attempts
+            try:
+                response = await rate_limiter.get_async(session, url, **kwargs)
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                if is_last:
+                    raise
+                reason = type(e).__name__
+            else:
+                if is_last or response.status_code not in self.RETRYABLE_STATUSES:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            
+            delay = self.get_delay(attempt)
+            print(f"🔁 {reason} from {urlsplit(url).hostname}, retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 2}/{self.max_attempts})")
+            await asyncio.sleep(delay)
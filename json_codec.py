@@ -0,0 +1,110 @@
+"""
+JSON encoding and decoding for the job monitor.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. dumps_pretty() always produces exactly the bytes that
+json.dump(obj, f, indent=2) would, so tracked_jobs.json doesn't change
+depending on which library wrote it.
+"""
+
+import json
+import os
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+
+# json.dumps escapes everything outside printable ASCII (DEL included),
+# orjson writes those characters as raw UTF-8
+NON_ASCII_RE = re.compile('[\x7f-\U0010ffff]')
+
+
+def escape_non_ascii(match):
+    """Escape a character the way json.dumps(ensure_ascii=True) does"""
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        high = 0xD800 | (code >> 10)
+        low = 0xDC00 | (code & 0x3FF)
+        return f'\\u{high:04x}\\u{low:04x}'
+    return f'\\u{code:04x}'
+
+
+CONTAINER_TYPES = (dict, list, tuple)
+
+
+def contains_float(obj):
+    """Check for floats, whose text form differs between orjson and json"""
+    if not isinstance(obj, CONTAINER_TYPES):
+        return isinstance(obj, float)
+    
+    stack = [obj]
+    while stack:
+        container = stack.pop()
+        values = container.values() if isinstance(container, dict) else container
+        # Look at the set of value types rather than every value, which keeps
+        # the scan cheap for long lists of flat records
+        types = set(map(type, values))
+        if any(issubclass(value_type, float) for value_type in types):
+            return True
+        if any(issubclass(value_type, CONTAINER_TYPES) for value_type in types):
+            stack.extend(value for value in values if isinstance(value, CONTAINER_TYPES))
+    return False
+
+
+def loads(data):
+    """Decode JSON from str or bytes"""
+    if orjson:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the standard library decide (e.g. NaN or integers beyond 64 bits)
+            pass
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Encode compactly, for values stored inside other formats"""
+    if orjson:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps_pretty(obj):
+    """Encode like json.dumps(obj, indent=2)"""
+    if orjson and not contains_float(obj):
+        try:
+            text = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            # Types orjson can't encode (e.g. integers beyond 64 bits)
+            return json.dumps(obj, indent=2)
+        if not text.isascii() or '\x7f' in text:
+            text = NON_ASCII_RE.sub(escape_non_ascii, text)
+        return text
+    return json.dumps(obj, indent=2)
+
+
+def dump_pretty(obj, f):
+    """Write obj to a text file like json.dump(obj, f, indent=2)"""
+    f.write(dumps_pretty(obj))
+
+
+def write_pretty(obj, path):
+    """Replace the file at path with dumps_pretty(obj), atomically
+    
+    The document is written to a temporary file next to it and renamed
+    over path, so a crash mid-write leaves the previous version intact.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        dump_pretty(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
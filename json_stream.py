@@ -0,0 +1,211 @@
+"""
+Incremental extraction of one array from a JSON document.
+
+Large boards (e.g. Greenhouse with content=true) return documents of many
+megabytes, mostly job descriptions. JsonArrayParser is fed the document in
+chunks and hands back the elements of the jobs array one at a time, so only
+the element currently being read has to be held in memory.
+"""
+
+import json
+import re
+
+import json_codec
+
+STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+SCALAR_RE = re.compile(r'[^\s,:\[\]{}"]+')
+WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+STRUCTURE_RE = re.compile(r'[\[\]{}"]')
+
+
+class JsonArrayParser:
+    """Push parser yielding the elements of the array at the most preferred of the given paths
+    
+    Paths are sequences of object keys from the document root, most
+    preferred first; an empty path matches a top-level array. Like the
+    'data', 'jobs' and 'results' keys in get_jobs_array, a path is out as
+    soon as the root object turns out to have the first key of a more
+    preferred path, whether or not that path leads to an array.
+    
+    An array found early may still lose to a more preferred one further
+    on, so elements come as (rank, element) pairs, rank being the index of
+    their path; rank tells which array won once the document is closed.
+    """
+    
+    def __init__(self, paths):
+        self.paths = [tuple(path) for path in paths]
+        self.ranks = {}
+        for rank, path in enumerate(self.paths):
+            self.ranks.setdefault(path, rank)
+        # Ranks of the paths still in the running, and of the arrays read whole
+        self.candidates = set(range(len(self.paths)))
+        self.complete = set()
+        self.buffer = ''
+        self.pos = 0
+        # One frame per open container: [kind, key, expecting, target rank or None]
+        self.stack = []
+        self.capture_start = None
+        self.capture_depth = 0
+        self.found = set()
+        self.done = False
+    
+    def feed(self, text):
+        """Add the next piece of the document, return the elements completed by it"""
+        if self.done:
+            return []
+        
+        self.buffer += text
+        items = []
+        self.parse(items, final=False)
+        
+        # Drop everything already consumed, except the element being captured
+        keep_from = self.pos if self.capture_start is None else self.capture_start
+        self.buffer = self.buffer[keep_from:]
+        self.pos -= keep_from
+        if self.capture_start is not None:
+            self.capture_start = 0
+        return items
+    
+    def close(self):
+        """Finish the document, return any remaining elements"""
+        items = []
+        if not self.done:
+            self.parse(items, final=True)
+        
+        if self.rank is None:
+            raise ValueError("jobs array not found in response")
+        if self.rank not in self.complete:
+            raise ValueError("response ended inside the jobs array")
+        return items
+    
+    @property
+    def rank(self):
+        """Rank of the most preferred array found among the paths still in the running"""
+        return min(self.found & self.candidates, default=None)
+    
+    def is_settled(self, rank):
+        """Whether no more preferred path can still turn up"""
+        return all(better not in self.candidates for better in range(rank))
+    
+    def read_root_key(self, key):
+        """Rule out the paths less preferred than the first one starting with key"""
+        for rank, path in enumerate(self.paths):
+            if path and path[0] == key:
+                self.candidates.intersection_update(range(rank + 1))
+                return
+    
+    def current_path(self):
+        """Object keys leading to the value about to start"""
+        return tuple(frame[1] if frame[0] == 'obj' else None for frame in self.stack)
+    
+    def in_target(self):
+        return bool(self.stack) and self.stack[-1][3] is not None
+    
+    def end_value(self):
+        """Mark the value in the innermost container as complete"""
+        if self.stack and self.stack[-1][0] == 'obj':
+            self.stack[-1][2] = 'comma'
+    
+    def parse(self, items, final):
+        buffer = self.buffer
+        
+        while not self.done:
+            self.pos = WHITESPACE_RE.match(buffer, self.pos).end()
+            if self.pos >= len(buffer):
+                return
+            
+            if self.capture_depth:
+                if not self.scan_capture(items):
+                    return
+                continue
+            
+            char = buffer[self.pos]
+            start = self.pos
+            
+            if char == '"':
+                match = STRING_RE.match(buffer, self.pos)
+                if not match:
+                    return
+                self.pos = match.end()
+                frame = self.stack[-1] if self.stack else None
+                if frame and frame[0] == 'obj' and frame[2] == 'key':
+                    frame[1] = json.loads(match.group())
+                    frame[2] = 'colon'
+                    if len(self.stack) == 1:
+                        self.read_root_key(frame[1])
+                elif self.in_target():
+                    items.append((self.stack[-1][3], json.loads(match.group())))
+                else:
+                    self.end_value()
+            
+            elif char in '{[':
+                self.pos += 1
+                if self.in_target():
+                    self.capture_start = start
+                    self.capture_depth = 1
+                    continue
+                
+                rank = self.ranks.get(self.current_path()) if char == '[' else None
+                if rank is not None and (rank not in self.candidates or rank > min(self.found, default=rank)):
+                    # Out of the running, or a more preferred array was already found
+                    rank = None
+                if rank is not None:
+                    self.found.add(rank)
+                kind = 'obj' if char == '{' else 'arr'
+                self.stack.append([kind, None, 'key' if kind == 'obj' else 'value', rank])
+            
+            elif char in '}]':
+                self.pos += 1
+                frame = self.stack.pop()
+                if frame[3] is not None:
+                    self.complete.add(frame[3])
+                    if self.is_settled(frame[3]):
+                        self.done = True
+                        return
+                self.end_value()
+            
+            elif char == ':':
+                self.pos += 1
+                self.stack[-1][2] = 'value'
+            
+            elif char == ',':
+                self.pos += 1
+                if self.stack[-1][0] == 'obj':
+                    self.stack[-1][2] = 'key'
+            
+            else:
+                match = SCALAR_RE.match(buffer, self.pos)
+                if not match:
+                    raise ValueError(f"unexpected character {char!r} in JSON")
+                if match.end() == len(buffer) and not final:
+                    # The number or literal may continue in the next chunk
+                    return
+                self.pos = match.end()
+                if self.in_target():
+                    items.append((self.stack[-1][3], json.loads(match.group())))
+                else:
+                    self.end_value()
+    
+    def scan_capture(self, items):
+        """Advance through the element being captured; False when more data is needed"""
+        buffer = self.buffer
+        match = STRUCTURE_RE.search(buffer, self.pos)
+        if not match:
+            self.pos = len(buffer)
+            return False
+        
+        self.pos = match.start()
+        char = buffer[self.pos]
+        if char == '"':
+            string_match = STRING_RE.match(buffer, self.pos)
+            if not string_match:
+                return False
+            self.pos = string_match.end()
+            return True
+        
+        self.pos += 1
+        self.capture_depth += 1 if char in '{[' else -1
+        if self.capture_depth == 0:
+            items.append((self.stack[-1][3], json_codec.loads(buffer[self.capture_start:self.pos])))
+            self.capture_start = None
+        return True
@@ -0,0 +1,130 @@
+"""
+Pagination support for job board APIs that don't return every job at once.
+
+Configured per company with a 'pagination' block, for example:
+
+    {"type": "offset", "offset_param": "skip", "limit_param": "limit", "page_size": 100}
+    {"type": "page", "page_param": "page", "first_page": 1, "total_path": "meta.total"}
+    {"type": "cursor", "cursor_param": "cursor", "cursor_path": "next_cursor"}
+    {"type": "next_link", "next_path": "links.next"}
+
+For offset and page pagination, setting total_path (total number of jobs)
+or total_pages_path lets every remaining page be requested concurrently
+once the first page is in. Without it pages are walked one by one until a
+short or empty page comes back. A board with more pages than max_pages is
+read only up to the cap, and the paginator's truncated attribute says so.
+"""
+
+import math
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+PAGINATION_TYPES = ('offset', 'page', 'cursor', 'next_link')
+
+
+def set_query_params(url, params):
+    """Return the URL with the given query parameters added or replaced"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class Paginator:
+    def __init__(self, company_config, get_field, get_items):
+        """Plan the page requests for a board
+        
+        get_field(data, path) reads a dotted path from a decoded page and
+        get_items(data) returns the page's jobs array.
+        """
+        self.config = company_config['pagination']
+        self.base_url = company_config['api_url']
+        self.get_field = get_field
+        self.get_items = get_items
+        
+        self.type = self.config.get('type', 'offset')
+        if self.type not in PAGINATION_TYPES:
+            raise ValueError(f"unknown pagination type: {self.type}")
+        
+        self.page_size = int(self.config.get('page_size', 100))
+        self.first_page = int(self.config.get('first_page', 1))
+        self.max_pages = int(self.config.get('max_pages', 100))
+        self.max_concurrency = max(1, int(self.config.get('max_concurrency', 4)))
+        # Why the walk stopped before the last page, or None
+        self.truncated = None
+    
+    def stop_at_max_pages(self):
+        """Note that pages past max_pages were left unread"""
+        self.truncated = f"stopped at the {self.max_pages} page limit"
+    
+    def get_page_url(self, page_index):
+        """URL of the page at a 0-based index (offset and page types)"""
+        params = {}
+        if self.config.get('limit_param', 'limit'):
+            params[self.config.get('limit_param', 'limit')] = self.page_size
+        
+        if self.type == 'offset':
+            params[self.config.get('offset_param', 'offset')] = page_index * self.page_size
+        else:
+            params[self.config.get('page_param', 'page')] = self.first_page + page_index
+        
+        return set_query_params(self.base_url, params)
+    
+    def first_url(self):
+        """URL of the first page"""
+        if self.type in ('offset', 'page'):
+            return self.get_page_url(0)
+        return self.base_url
+    
+    def get_page_count(self, first_data):
+        """Total number of pages if the first page says so, else None"""
+        if self.type not in ('offset', 'page'):
+            return None
+        
+        if self.config.get('total_pages_path'):
+            total_pages = self.get_field(first_data, self.config['total_pages_path'])
+        elif self.config.get('total_path'):
+            total = self.get_field(first_data, self.config['total_path'])
+            total_pages = math.ceil(int(total) / self.page_size) if str(total).isdigit() else None
+        else:
+            return None
+        
+        if not str(total_pages).isdigit():
+            return None
+        if int(total_pages) > self.max_pages:
+            self.stop_at_max_pages()
+            return self.max_pages
+        return int(total_pages)
+    
+    def remaining_urls(self, first_data):
+        """URLs of every page after the first when the total is known, else None"""
+        page_count = self.get_page_count(first_data)
+        if page_count is None:
+            return None
+        return [self.get_page_url(page_index) for page_index in range(1, page_count)]
+    
+    def next_url(self, url, data, page_index):
+        """URL of the page after the one at page_index, or None when done"""
+        next_url = self.find_next_url(url, data, page_index)
+        if next_url and page_index + 1 >= self.max_pages:
+            self.stop_at_max_pages()
+            return None
+        return next_url
+    
+    def find_next_url(self, url, data, page_index):
+        """URL of the page the current one points to, ignoring max_pages"""
+        if self.type in ('offset', 'page'):
+            items = self.get_items(data)
+            if not isinstance(items, list) or len(items) < self.page_size:
+                return None
+            return self.get_page_url(page_index + 1)
+        
+        if self.type == 'cursor':
+            cursor = self.get_field(data, self.config.get('cursor_path', 'next_cursor'))
+            if not cursor:
+                return None
+            return set_query_params(self.base_url, {self.config.get('cursor_param', 'cursor'): cursor})
+        
+        next_link = self.get_field(data, self.config.get('next_path', 'next'))
+        if not next_link:
+            return None
+        return urljoin(url, next_link)
@@ -0,0 +1,54 @@
+"""
+Plumbing for the monitor's streaming fetch -> extract -> diff pipeline.
+
+Boards are fetched by worker threads (or coroutines) and handed to the
+merge stage through a BoundedBuffer. Workers wait while the buffer is
+full, so only a few finished boards' jobs are held in memory however
+many boards are configured.
+"""
+
+import queue
+import threading
+from collections import deque
+
+# Put by a producer after its last item
+END = object()
+
+
+class BoundedBuffer:
+    """Thread-safe FIFO whose producers wait while it is full"""
+    
+    def __init__(self, maxsize):
+        self.maxsize = max(1, int(maxsize))
+        self.items = deque()
+        self.closed = False
+        self.condition = threading.Condition()
+    
+    def put(self, item):
+        """Add an item, waiting for room; returns False once the buffer is closed"""
+        with self.condition:
+            while len(self.items) >= self.maxsize and not self.closed:
+                self.condition.wait()
+            if self.closed:
+                return False
+            
+            self.items.append(item)
+            self.condition.notify_all()
+            return True
+    
+    def get(self, timeout=None):
+        """Remove the oldest item, raising queue.Empty if none arrives in time"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.items, timeout):
+                raise queue.Empty
+            
+            item = self.items.popleft()
+            self.condition.notify_all()
+            return item
+    
+    def close(self):
+        """Drop buffered items and release waiting producers"""
+        with self.condition:
+            self.closed = True
+            self.items.clear()
+            self.condition.notify_all()
@@ -1,17 +1,262 @@
 import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
+import codecs
 import json
 import os
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 import hashlib
+import itertools
+import threading
+import time
+
+from board_cache import BoardCache, get_body_hash
+from html_backends import get_html_backend
+from html_stream import HtmlPrefixReader, parse_job_element_selector
+from json_stream import JsonArrayParser
+from pagination import Paginator
+from pipeline import END, BoundedBuffer
+from storage import JobRecord, LazyJobs, create_storage
+from http_client import ACCEPT_ENCODING, RateLimiter, RetryPolicy, create_session, decode_text, get_pool_settings
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+ENGINES = ('threads', 'asyncio')
+REQUEST_TIMEOUT = 15
+# API jobs are filtered column by column in batches of this many jobs
+JOB_BATCH_SIZE = 4096
+
+API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json',
+}
+
+HTML_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+class FieldPath:
+    """A dotted field path (e.g. 'departments.0.name') split once into lookup steps"""
+    
+    __slots__ = ('steps',)
+    
+    def __init__(self, field_path):
+        if not field_path:
+            self.steps = None
+        else:
+            # Each step keeps the dict key and, for numeric keys, the list index
+            self.steps = tuple(
+                (key, int(key) if key.isdigit() else None)
+                for key in str(field_path).split('.')
+            )
+    
+    def get(self, data):
+        """Read the field from a decoded job object, '' when missing"""
+        if self.steps is None:
+            return ''
+        
+        value = data
+        for key, index in self.steps:
+            if isinstance(value, dict):
+                value = value.get(key, '')
+            elif index is not None and isinstance(value, list):
+                value = value[index] if index < len(value) else ''
+            else:
+                return ''
+        
+        return value
+
+
+@lru_cache(maxsize=None)
+def compile_field_path(field_path):
+    """Return the shared compiled accessor for a field path"""
+    return FieldPath(field_path)
+
+
+def build_trie_pattern(terms):
+    """Build a regex matching any of the terms, with shared prefixes factored out
+    
+    Every alternation in the result starts with a distinct character, so a
+    failed match costs one step per trie level instead of one per term.
+    """
+    trie = {}
+    for term in sorted(set(terms), key=len):
+        node = trie
+        for char in term:
+            if '' in node:
+                break
+            node = node.setdefault(char, {})
+        else:
+            # A shorter term already matches wherever this one would
+            node.clear()
+            node[''] = True
+    
+    def to_pattern(node):
+        if '' in node:
+            return ''
+        
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        
+        single_chars = [branch for branch in branches if len(branch) == 1]
+        if len(single_chars) > 1:
+            branches = [branch for branch in branches if len(branch) != 1]
+            branches.append('[' + ''.join(single_chars) + ']')
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    
+    return to_pattern(trie)
+
+
+class TermMatcher:
+    """Case-insensitive substring test for any of a list of filter terms"""
+    
+    __slots__ = ('search',)
+    
+    def __init__(self, terms):
+        terms = [str(term).lower() for term in terms]
+        if not terms or '' in terms:
+            # No filter, or an empty term that every value contains
+            self.search = None
+        else:
+            self.search = re.compile(build_trie_pattern(terms)).search
+    
+    def matches(self, value):
+        return self.search is None or self.search(str(value).lower()) is not None
+    
+    def select(self, values):
+        """Match a whole column of values, returning a list of booleans
+        
+        Each distinct value is tested once. Only columns of strings (and
+        None) are deduplicated, since 1, 1.0 and True hash alike but print
+        differently.
+        """
+        if self.search is None:
+            return [True] * len(values)
+        
+        try:
+            distinct = set(values)
+        except TypeError:
+            distinct = None
+        if distinct is None or not all(value is None or type(value) is str for value in distinct):
+            return [self.matches(value) for value in values]
+        
+        results = {value: self.matches(value) for value in distinct}
+        return list(map(results.__getitem__, values))
+
+
+@lru_cache(maxsize=None)
+def compile_filter_terms(terms):
+    """Return the shared compiled matcher for a tuple of filter terms"""
+    return TermMatcher(terms)
+
+
+class JobFilter:
+    """A company's department and location filters, compiled once"""
+    
+    __slots__ = ('department', 'location')
+    
+    def __init__(self, company_config):
+        self.department = compile_filter_terms(tuple(company_config.get('departments', [])))
+        self.location = compile_filter_terms(tuple(company_config.get('locations', [])))
+    
+    def matches(self, department, location):
+        return self.department.matches(department) and self.location.matches(location)
+    
+    def select(self, departments, locations):
+        """Selection mask for a batch given as department and location columns"""
+        return [
+            department_match and location_match
+            for department_match, location_match in zip(
+                self.department.select(departments), self.location.select(locations)
+            )
+        ]
+
+
+class StreamedApiJobs:
+    """Streaming consumer that extracts matching jobs from a board element by element
+    
+    Jobs are kept per candidate array until the parser knows which one
+    get_jobs_array would have picked; only matching jobs are kept, so a
+    losing array costs little.
+    """
+    
+    def __init__(self, monitor, company_config, paths):
+        self.monitor = monitor
+        self.company_config = company_config
+        self.parser = JsonArrayParser(paths)
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        # Rank of the array -> (elements read, matching jobs)
+        self.candidates = {}
+        self.total = 0
+        self.jobs = []
+    
+    def add(self, items):
+        for rank, group in itertools.groupby(items, key=lambda item: item[0]):
+            elements = [element for _, element in group]
+            total, jobs = self.candidates.get(rank, (0, []))
+            jobs.extend(self.monitor.iter_api_jobs(self.company_config, elements))
+            self.candidates[rank] = (total + len(elements), jobs)
+    
+    def feed(self, data):
+        self.add(self.parser.feed(self.decoder.decode(data)))
+    
+    def close(self):
+        self.add(self.parser.feed(self.decoder.decode(b'', final=True)))
+        self.add(self.parser.close())
+        self.total, self.jobs = self.candidates.get(self.parser.rank, (0, []))
+        return self
+
+
+def iter_batches(items, size):
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
 
 
 class JobMonitor:
-    def __init__(self, config_file='job_config.json'):
+    def __init__(self, config_file='job_config.json', engine=None):
         """Initialize the job monitor"""
         self.config = self.load_config(config_file)
-        self.jobs_file = 'tracked_jobs.json'
+        self.engine = engine or self.config.get('engine', 'threads')
+        self.pool_connections, self.pool_maxsize = get_pool_settings(self.config)
+        self.session = create_session(self.pool_connections, self.pool_maxsize)
+        self.rate_limiter = RateLimiter.from_config(self.config)
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.storage = create_storage(self.config, [company['name'] for company in self.config['companies']])
         self.existing_data = self.load_existing_data()
+        breaker_config = self.config.get('circuit_breaker', {})
+        self.board_cache = BoardCache(
+            self.config.get('fetch_cache_file', 'fetch_cache.json'),
+            int(breaker_config.get('failure_threshold', 3)),
+            float(breaker_config.get('cooldown_hours', 24))
+        )
+        self.stats_lock = threading.Lock()
+        self.run_stats = {}
+        self.truncated_boards = {}
+        # Set when the run stops waiting for boards still being fetched
+        self.cancelled = threading.Event()
     
     def load_config(self, config_file):
         """Load monitoring configuration"""
@@ -22,20 +267,18 @@ class JobMonitor:
     
     def load_existing_data(self):
         """Load existing job data with migration from old format"""
-        if not os.path.exists(self.jobs_file):
-            return {
-                "jobs": [],
-                "metadata": {
-                    "last_updated": None,
-                    "total_jobs": 0,
-                    "companies_count": 0,
-                    "departments_count": 0
-                }
-            }
-        
         try:
-            with open(self.jobs_file, 'r') as f:
-                data = json.load(f)
+            data = self.storage.load()
+            if data is None:
+                return {
+                    "jobs": [],
+                    "metadata": {
+                        "last_updated": None,
+                        "total_jobs": 0,
+                        "companies_count": 0,
+                        "departments_count": 0
+                    }
+                }
             
             # Check if old format (flat dictionary with hash keys)
             if isinstance(data, dict) and "jobs" not in data:
@@ -65,7 +308,7 @@ class JobMonitor:
             
             # Already in new format
             return data
-            
+        
         except Exception as e:
             print(f"❌ Error loading data: {e}")
             return {
@@ -81,12 +324,19 @@ class JobMonitor:
     def save_data(self):
         """Save job data in new format"""
         try:
-            with open(self.jobs_file, 'w') as f:
-                json.dump(self.existing_data, f, indent=2)
-            print(f"💾 Saved {len(self.existing_data['jobs'])} jobs to {self.jobs_file}")
+            total = len(self.existing_data['jobs']) + self.existing_data.get('unloaded_jobs', 0)
+            written = self.storage.save(self.existing_data)
+            print(f"💾 Saved {total} jobs to {self.storage.path}" + (f" ({written} written)" if written != total else ""))
         except Exception as e:
             print(f"❌ Error saving data: {e}")
     
+    def count_stat(self, name, amount=1):
+        """Increment a per-run counter shown in the summary"""
+        if self.cancelled.is_set():
+            return
+        with self.stats_lock:
+            self.run_stats[name] = self.run_stats.get(name, 0) + amount
+    
     def get_job_id(self, job):
         """Create unique ID for a job"""
         job_string = f"{job['company']}_{job['title']}_{job['department']}"
@@ -94,35 +344,11 @@ class JobMonitor:
     
     def get_nested_field(self, data, field_path):
         """Get nested field from dict (e.g., 'departments.0.name')"""
-        if not field_path:
-            return ''
-        
-        value = data
-        for key in str(field_path).split('.'):
-            if isinstance(value, dict):
-                value = value.get(key, '')
-            elif isinstance(value, list) and key.isdigit():
-                idx = int(key)
-                value = value[idx] if idx < len(value) else ''
-            else:
-                return ''
-        
-        return value
+        return compile_field_path(field_path).get(data)
     
     def matches_filters(self, department, location, config):
         """Check if job matches department/location filters"""
-        dept_filter = config.get('departments', [])
-        loc_filter = config.get('locations', [])
-        
-        dept_match = not dept_filter or any(
-            d.lower() in str(department).lower() for d in dept_filter
-        )
-        
-        loc_match = not loc_filter or any(
-            loc.lower() in str(location).lower() for loc in loc_filter
-        )
-        
-        return dept_match and loc_match
+        return JobFilter(config).matches(department, location)
     
     def is_job_new(self, found_date):
         """Check if job was found less than 7 days ago"""
@@ -133,233 +359,886 @@ class JobMonitor:
         except:
             return False
     
-    def fetch_jobs_from_api(self, company_config):
-        """Fetch jobs from JSON API"""
-        jobs = []
+    def get_jobs_array(self, company_config, data):
+        """Navigate a decoded API response to its jobs array"""
+        # Navigate to jobs array
+        jobs_data = data
+        if isinstance(data, dict):
+            if 'data' in data:
+                jobs_data = data['data']
+            elif 'jobs' in data:
+                jobs_data = data['jobs']
+            elif 'results' in data:
+                jobs_data = data['results']
         
-        try:
-            print(f"\n📡 Fetching jobs from {company_config['name']} API...")
-            print(f"🔗 URL: {company_config['api_url']}")
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-            }
-            
-            response = requests.get(company_config['api_url'], headers=headers, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Navigate to jobs array
-            jobs_data = data
-            if isinstance(data, dict):
-                if 'data' in data:
-                    jobs_data = data['data']
-                elif 'jobs' in data:
-                    jobs_data = data['jobs']
-                elif 'results' in data:
-                    jobs_data = data['results']
-            
-            # Custom path if specified
-            if 'api_jobs_path' in company_config:
-                for key in company_config['api_jobs_path'].split('.'):
-                    jobs_data = jobs_data[key]
-            
-            if not isinstance(jobs_data, list):
-                print(f"⚠️ Expected list of jobs, got {type(jobs_data)}")
-                return []
-            
-            print(f"✓ Found {len(jobs_data)} total jobs")
+        # Custom path if specified
+        if 'api_jobs_path' in company_config:
+            for key in company_config['api_jobs_path'].split('.'):
+                jobs_data = jobs_data[key]
+        
+        return jobs_data
+    
+    def extract_jobs_from_api_data(self, company_config, data):
+        """Extract matching jobs from a decoded API response"""
+        jobs_data = self.get_jobs_array(company_config, data)
+        
+        if not isinstance(jobs_data, list):
+            print(f"⚠️ Expected list of jobs, got {type(jobs_data)}")
+            return []
+        
+        print(f"✓ Found {len(jobs_data)} total jobs")
+        return self.extract_api_jobs(company_config, jobs_data)
+    
+    def extract_api_jobs(self, company_config, jobs_data):
+        """Extract matching jobs from an iterable of API job objects"""
+        jobs = list(self.iter_api_jobs(company_config, jobs_data))
+        print(f"✓ {len(jobs)} jobs match your filters")
+        return jobs
+    
+    def iter_api_jobs(self, company_config, jobs_data):
+        """Yield the matching jobs of an iterable of API job objects"""
+        # Compile the field paths once for the whole board
+        title_field = compile_field_path(company_config.get('api_title_field', 'title'))
+        department_field = compile_field_path(company_config.get('api_department_field', 'department'))
+        location_field = compile_field_path(company_config.get('api_location_field', 'location'))
+        link_field = compile_field_path(company_config.get('api_link_field', 'url'))
+        job_filter = JobFilter(company_config)
+        base = company_config.get('base_url', company_config['api_url'].split('/api')[0]).rstrip('/')
+        
+        # Extract jobs in batches: the department column is filtered first,
+        # then the locations of the remaining jobs, and only the jobs that
+        # pass both have their title and link extracted
+        for batch in iter_batches(jobs_data, JOB_BATCH_SIZE):
+            departments = [department_field.get(job_data) for job_data in batch]
+            selected = [
+                index for index, keep in enumerate(job_filter.department.select(departments)) if keep
+            ]
+            locations = [location_field.get(batch[index]) for index in selected]
+            location_mask = job_filter.location.select(locations)
+            found_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # Extract jobs
-            for job_data in jobs_data:
+            for index, location, keep in zip(selected, locations, location_mask):
+                if not keep:
+                    continue
+                
                 try:
-                    title = self.get_nested_field(job_data, company_config.get('api_title_field', 'title'))
-                    department = self.get_nested_field(job_data, company_config.get('api_department_field', 'department'))
-                    location = self.get_nested_field(job_data, company_config.get('api_location_field', 'location'))
-                    link = self.get_nested_field(job_data, company_config.get('api_link_field', 'url'))
+                    job_data = batch[index]
+                    department = departments[index]
+                    title = title_field.get(job_data)
+                    link = link_field.get(job_data)
                     
                     # Make link absolute
                     if link and not link.startswith('http'):
-                        base = company_config.get('base_url', company_config['api_url'].split('/api')[0])
-                        link = base.rstrip('/') + '/' + link.lstrip('/')
+                        link = base + '/' + link.lstrip('/')
                     
-                    # Filter by department and location
-                    if self.matches_filters(department, location, company_config):
-                        job = {
-                            'company': company_config['name'],
-                            'title': str(title),
-                            'department': str(department),
-                            'location': str(location),
-                            'link': link,
-                            'found_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        jobs.append(job)
+                    job = {
+                        'company': company_config['name'],
+                        'title': str(title),
+                        'department': str(department),
+                        'location': str(location),
+                        'link': link,
+                        'found_date': found_date
+                    }
+                    yield job
                 
                 except Exception as e:
                     print(f"⚠️ Error parsing job: {e}")
                     continue
-            
-            print(f"✓ {len(jobs)} jobs match your filters")
+    
+    def extract_jobs_from_html_text(self, company_config, html):
+        """Extract matching jobs from an HTML page"""
+        jobs = []
+        
+        backend = get_html_backend(company_config.get('html_parser'))
+        container_selector = company_config.get('container_selector')
+        document = backend.parse(html, container_selector)
+        if document is None:
+            print(f"⚠️ No element matches container_selector '{container_selector}'")
             return jobs
+        
+        # Find all job listings
+        job_elements = backend.select(document, company_config['job_selector'])
+        print(f"✓ Found {len(job_elements)} total job listings")
+        job_filter = JobFilter(company_config)
+        base_url = '/'.join(company_config['url'].split('/')[:3])
+        
+        # HTML boards have no location, so a location filter rejects every job
+        if not job_filter.location.matches(''):
+            job_elements = []
+        
+        for job_elem in job_elements:
+            try:
+                # Check the department before touching the other fields
+                dept_elem = backend.select_one(job_elem, company_config['department_selector'])
+                department = backend.get_text(dept_elem) if dept_elem is not None else "Unknown"
+                if not job_filter.department.matches(department):
+                    continue
+                
+                title_elem = backend.select_one(job_elem, company_config['title_selector'])
+                if title_elem is None:
+                    continue
+                
+                title = backend.get_text(title_elem)
+                link_elem = backend.select_one(job_elem, company_config['link_selector'])
+                link = backend.get_attr(link_elem, 'href') if link_elem is not None else ''
+                
+                # Make link absolute
+                if link and not link.startswith('http'):
+                    link = base_url + link if link.startswith('/') else base_url + '/' + link
+                
+                job = {
+                    'company': company_config['name'],
+                    'title': title,
+                    'department': department,
+                    'location': '',
+                    'link': link,
+                    'found_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }
+                jobs.append(job)
+            
+            except Exception as e:
+                continue
+        
+        print(f"✓ {len(jobs)} jobs match your filters")
+        return jobs
+    
+    def get_not_modified_jobs(self, status_code, cache_key, company_config):
+        """Return cached jobs when the board answered 304 Not Modified"""
+        if status_code != 304:
+            self.count_stat('cache_misses')
+            return None
+        
+        jobs = self.board_cache.cached_jobs(cache_key, company_config)
+        if jobs is None:
+            raise ValueError("got 304 Not Modified without a cached response")
+        
+        self.count_stat('cache_hits')
+        print(f"✓ Not modified, reusing {len(jobs)} cached jobs")
+        truncated = self.board_cache.get_truncation(cache_key, company_config)
+        if truncated:
+            self.record_truncation(company_config, truncated)
+        return jobs
+    
+    def get_unchanged_jobs(self, body, cache_key, company_config):
+        """Return cached jobs when the response body is identical to last run's"""
+        body_hash = get_body_hash(body)
+        jobs = self.board_cache.cached_jobs(cache_key, company_config, body_hash)
+        if jobs is None:
+            return body_hash, None
+        
+        self.count_stat('unchanged_bodies')
+        print(f"✓ Response unchanged, reusing {len(jobs)} cached jobs")
+        return body_hash, jobs
+    
+    def report_transfer(self, response):
+        """Print and count the compressed and decompressed size of a response"""
+        self.count_stat('wire_bytes', response.wire_bytes)
+        self.count_stat('body_bytes', response.body_size)
+        if response.body_size:
+            print(f"📦 {format_bytes(response.wire_bytes)} transferred ({response.content_encoding}), "
+                  f"{format_bytes(response.body_size)} decompressed")
+    
+    def get_stream_paths(self, company_config):
+        """Candidate locations of the jobs array for streaming extraction
+        
+        Mirrors get_jobs_array: the array under 'data', 'jobs' or 'results'
+        (in that order of preference), followed by api_jobs_path.
+        """
+        extra_path = company_config['api_jobs_path'].split('.') if 'api_jobs_path' in company_config else []
+        return [[key] + extra_path for key in ('data', 'jobs', 'results')] + [extra_path]
+    
+    def create_stream_consumer(self, company_config):
+        """Consumer factory for boards configured with stream_json"""
+        if not company_config.get('stream_json'):
+            return None
+        return partial(StreamedApiJobs, self, company_config, self.get_stream_paths(company_config))
+    
+    def process_api_response(self, company_config, response):
+        """Turn an API response into jobs, reusing cached jobs for unchanged boards"""
+        cache_key = company_config['api_url']
+        self.report_transfer(response)
+        
+        cached_jobs = self.get_not_modified_jobs(response.status_code, cache_key, company_config)
+        if cached_jobs is not None:
+            return cached_jobs
+        response.raise_for_status()
+        
+        if response.consumed is not None:
+            # Streamed boards were extracted while downloading
+            streamed = response.consumed
+            print(f"✓ Found {streamed.total} total jobs (streamed)")
+            print(f"✓ {len(streamed.jobs)} jobs match your filters")
+            self.board_cache.store(cache_key, company_config, response.headers, response.body_hash, streamed.jobs)
+            return streamed.jobs
+        
+        body_hash, cached_jobs = self.get_unchanged_jobs(response.body, cache_key, company_config)
+        if cached_jobs is not None:
+            return cached_jobs
+        data = response.json()
+        
+        jobs = self.extract_jobs_from_api_data(company_config, data)
+        self.board_cache.store(cache_key, company_config, response.headers, body_hash, jobs)
+        return jobs
+    
+    def create_html_consumer(self, company_config):
+        """Consumer factory for HTML boards with max_jobs or max_bytes limits"""
+        max_jobs = company_config.get('max_jobs')
+        max_bytes = company_config.get('max_bytes')
+        if not max_jobs and not max_bytes:
+            return None
+        
+        if parse_job_element_selector(company_config['job_selector']) is None:
+            print(f"⚠️ max_jobs/max_bytes need a job_selector ending in a tag, #id or .class, "
+                  f"reading the whole page")
+            return None
+        return partial(HtmlPrefixReader, company_config['job_selector'], max_jobs, max_bytes)
+    
+    def record_truncation(self, company_config, reason):
+        """Remember a board read only in part, whose unseen jobs must stay as they are"""
+        if not self.cancelled.is_set():
+            self.truncated_boards[company_config['name']] = reason
+        print(f"✂️ Only part of the board was read: {reason}")
+    
+    def process_html_response(self, company_config, response):
+        """Turn an HTML response into jobs, reusing cached jobs for unchanged boards"""
+        cache_key = company_config['url']
+        self.report_transfer(response)
+        
+        cached_jobs = self.get_not_modified_jobs(response.status_code, cache_key, company_config)
+        if cached_jobs is not None:
+            return cached_jobs
+        response.raise_for_status()
+        
+        body = response.body
+        truncated = None
+        if response.consumed is not None:
+            # Limited boards stop downloading once enough was read
+            body = response.consumed.body
+            truncated = response.consumed.truncated
+            if truncated:
+                self.record_truncation(company_config, truncated)
+        
+        body_hash, cached_jobs = self.get_unchanged_jobs(body, cache_key, company_config)
+        if cached_jobs is not None:
+            return cached_jobs
+        
+        jobs = self.extract_jobs_from_html_text(company_config, decode_text(body, response.headers))
+        self.board_cache.store(cache_key, company_config, response.headers, body_hash, jobs, truncated)
+        return jobs
+    
+    def create_paginator(self, company_config):
+        """Plan the page requests of a paginated API board"""
+        return Paginator(
+            company_config,
+            self.get_nested_field,
+            lambda data: self.get_jobs_array(company_config, data)
+        )
+    
+    def process_paginated_responses(self, company_config, responses, pages, truncated=None):
+        """Turn every page of a paginated API board into jobs
+        
+        truncated describes why pages were left unread, if they were.
+        """
+        cache_key = company_config['api_url']
+        self.count_stat('cache_misses')
+        if truncated:
+            self.record_truncation(company_config, truncated)
+        
+        # Pages can change independently, so the board is unchanged only if every page is
+        pages_digest = ''.join(get_body_hash(response.body) for response in responses)
+        body_hash, cached_jobs = self.get_unchanged_jobs(pages_digest.encode(), cache_key, company_config)
+        if cached_jobs is not None:
+            return cached_jobs
+        
+        jobs_arrays = [self.get_jobs_array(company_config, data) for data in pages]
+        for jobs_data in jobs_arrays:
+            if not isinstance(jobs_data, list):
+                print(f"⚠️ Expected list of jobs, got {type(jobs_data)}")
+                return []
+        
+        print(f"✓ Found {sum(len(jobs_data) for jobs_data in jobs_arrays)} total jobs across {len(pages)} pages")
+        jobs = self.extract_api_jobs(company_config, itertools.chain.from_iterable(jobs_arrays))
+        self.board_cache.store(cache_key, company_config, {}, body_hash, jobs, truncated)
+        return jobs
+    
+    def fetch_page(self, url):
+        """Fetch a single page of a paginated API"""
+        response = self.retry_policy.get(
+            self.rate_limiter, self.session, url, headers=API_HEADERS, timeout=REQUEST_TIMEOUT,
+            cancel=self.cancelled
+        )
+        self.report_transfer(response)
+        response.raise_for_status()
+        return response
+    
+    def fetch_paginated_api(self, company_config):
+        """Fetch every page of a paginated API, prefetching when the total is known"""
+        paginator = self.create_paginator(company_config)
+        url = paginator.first_url()
+        responses = [self.fetch_page(url)]
+        pages = [responses[0].json()]
+        
+        remaining_urls = paginator.remaining_urls(pages[0])
+        if remaining_urls:
+            print(f"📄 Prefetching {len(remaining_urls)} more pages")
+            with ThreadPoolExecutor(max_workers=min(paginator.max_concurrency, len(remaining_urls))) as executor:
+                responses += list(executor.map(self.fetch_page, remaining_urls))
+            pages += [response.json() for response in responses[1:]]
+        elif remaining_urls is None:
+            page_index = 0
+            url = paginator.next_url(url, pages[-1], page_index)
+            while url:
+                responses.append(self.fetch_page(url))
+                pages.append(responses[-1].json())
+                page_index += 1
+                url = paginator.next_url(url, pages[-1], page_index)
+        
+        return self.process_paginated_responses(company_config, responses, pages, paginator.truncated)
+    
+    def fetch_jobs_from_api(self, company_config):
+        """Fetch jobs from JSON API"""
+        try:
+            print(f"\n📡 Fetching jobs from {company_config['name']} API...")
+            print(f"🔗 URL: {company_config['api_url']}")
             
+            if 'pagination' in company_config:
+                return self.fetch_paginated_api(company_config)
+            
+            headers = self.board_cache.conditional_headers(company_config['api_url'], company_config, API_HEADERS)
+            response = self.retry_policy.get(
+                self.rate_limiter, self.session, company_config['api_url'], headers=headers, timeout=REQUEST_TIMEOUT,
+                consume=self.create_stream_consumer(company_config), cancel=self.cancelled
+            )
+            return self.process_api_response(company_config, response)
+        
         except requests.exceptions.RequestException as e:
-            print(f"❌ Network error: {e}")
-            return []
+            # Abandoned at the deadline, after the summary; the board is reported as deferred
+            if not self.cancelled.is_set():
+                print(f"❌ Network error: {e}")
+            return None
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON response: {e}")
-            return []
+            return None
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
-            return []
+            return None
     
     def fetch_jobs_from_html(self, company_config):
         """Fetch jobs from HTML page"""
-        jobs = []
-        
         try:
             print(f"\n📡 Fetching jobs from {company_config['name']}...")
             print(f"🔗 URL: {company_config['url']}")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(company_config['url'], headers=headers, timeout=15)
-            response.raise_for_status()
+            headers = self.board_cache.conditional_headers(company_config['url'], company_config, HTML_HEADERS)
+            response = self.retry_policy.get(
+                self.rate_limiter, self.session, company_config['url'], headers=headers, timeout=REQUEST_TIMEOUT,
+                consume=self.create_html_consumer(company_config), cancel=self.cancelled
+            )
+            return self.process_html_response(company_config, response)
+        
+        except Exception as e:
+            if not self.cancelled.is_set():
+                print(f"❌ Error: {e}")
+            return None
+    
+    def get_board_key(self, company_config):
+        """Key identifying a board in the fetch cache"""
+        return company_config.get('api_url', company_config.get('url'))
+    
+    def is_circuit_open(self, company_config):
+        """Check whether a board is being skipped after repeated failures"""
+        open_until = self.board_cache.get_open_until(self.get_board_key(company_config))
+        if open_until is None:
+            return False
+        
+        print(f"\n⏸️ Skipping {company_config['name']}: failing repeatedly, "
+              f"next attempt after {open_until.strftime('%Y-%m-%d %H:%M:%S')}")
+        return True
+    
+    def record_fetch_result(self, company_config, jobs):
+        """Update the board's circuit breaker with the outcome of a fetch"""
+        if self.cancelled.is_set():
+            # Abandoned at the deadline; the board is deferred instead
+            return
+        board_key = self.get_board_key(company_config)
+        if jobs is not None:
+            self.board_cache.record_success(board_key)
+            return
+        
+        failures = self.board_cache.record_failure(board_key)
+        print(f"⚠️ {company_config['name']} failed {failures} time(s) in a row, keeping its jobs unchanged")
+    
+    def fetch_jobs(self, company_config):
+        """Route to appropriate fetch method
+        
+        Returns None when the board could not be fetched, in which case the
+        board's existing jobs keep their current state.
+        """
+        if self.is_circuit_open(company_config):
+            return None
+        
+        if 'api_url' in company_config:
+            jobs = self.fetch_jobs_from_api(company_config)
+        else:
+            jobs = self.fetch_jobs_from_html(company_config)
+        
+        self.record_fetch_result(company_config, jobs)
+        return jobs
+    
+    async def fetch_page_async(self, session, url):
+        """Fetch a single page of a paginated API (asyncio engine)"""
+        response = await self.retry_policy.get_async(self.rate_limiter, session, url, headers=API_HEADERS)
+        self.report_transfer(response)
+        response.raise_for_status()
+        return response
+    
+    async def fetch_paginated_api_async(self, session, company_config):
+        """Fetch every page of a paginated API, prefetching when the total is known (asyncio engine)"""
+        paginator = self.create_paginator(company_config)
+        url = paginator.first_url()
+        responses = [await self.fetch_page_async(session, url)]
+        pages = [responses[0].json()]
+        
+        remaining_urls = paginator.remaining_urls(pages[0])
+        if remaining_urls:
+            print(f"📄 Prefetching {len(remaining_urls)} more pages")
+            semaphore = asyncio.Semaphore(paginator.max_concurrency)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            async def fetch_bounded(page_url):
+                async with semaphore:
+                    return await self.fetch_page_async(session, page_url)
             
-            # Find all job listings
-            job_elements = soup.select(company_config['job_selector'])
-            print(f"✓ Found {len(job_elements)} total job listings")
+            responses += await asyncio.gather(*(fetch_bounded(page_url) for page_url in remaining_urls))
+            pages += [response.json() for response in responses[1:]]
+        elif remaining_urls is None:
+            page_index = 0
+            url = paginator.next_url(url, pages[-1], page_index)
+            while url:
+                responses.append(await self.fetch_page_async(session, url))
+                pages.append(responses[-1].json())
+                page_index += 1
+                url = paginator.next_url(url, pages[-1], page_index)
+        
+        return self.process_paginated_responses(company_config, responses, pages, paginator.truncated)
+    
+    async def fetch_jobs_from_api_async(self, session, company_config):
+        """Fetch jobs from JSON API (asyncio engine)"""
+        try:
+            print(f"\n📡 Fetching jobs from {company_config['name']} API...")
+            print(f"🔗 URL: {company_config['api_url']}")
             
-            for job_elem in job_elements:
-                try:
-                    title_elem = job_elem.select_one(company_config['title_selector'])
-                    dept_elem = job_elem.select_one(company_config['department_selector'])
-                    link_elem = job_elem.select_one(company_config['link_selector'])
-                    
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    department = dept_elem.get_text(strip=True) if dept_elem else "Unknown"
-                    link = link_elem.get('href', '') if link_elem else ''
-                    
-                    # Make link absolute
-                    if link and not link.startswith('http'):
-                        base_url = '/'.join(company_config['url'].split('/')[:3])
-                        link = base_url + link if link.startswith('/') else base_url + '/' + link
-                    
-                    # Filter
-                    if self.matches_filters(department, '', company_config):
-                        job = {
-                            'company': company_config['name'],
-                            'title': title,
-                            'department': department,
-                            'location': '',
-                            'link': link,
-                            'found_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        jobs.append(job)
-                
-                except Exception as e:
-                    continue
+            if 'pagination' in company_config:
+                return await self.fetch_paginated_api_async(session, company_config)
             
-            print(f"✓ {len(jobs)} jobs match your filters")
-            return jobs
+            headers = self.board_cache.conditional_headers(company_config['api_url'], company_config, API_HEADERS)
+            response = await self.retry_policy.get_async(
+                self.rate_limiter, session, company_config['api_url'], headers=headers,
+                consume=self.create_stream_consumer(company_config)
+            )
+            return self.process_api_response(company_config, response)
+        
+        except (aiohttp.ClientError, asyncio.TimeoutError, requests.exceptions.RequestException) as e:
+            print(f"❌ Network error: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            print(f"❌ Invalid JSON response: {e}")
+            return None
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            return None
+    
+    async def fetch_jobs_from_html_async(self, session, company_config):
+        """Fetch jobs from HTML page (asyncio engine)"""
+        try:
+            print(f"\n📡 Fetching jobs from {company_config['name']}...")
+            print(f"🔗 URL: {company_config['url']}")
             
+            headers = self.board_cache.conditional_headers(company_config['url'], company_config, HTML_HEADERS)
+            response = await self.retry_policy.get_async(
+                self.rate_limiter, session, company_config['url'], headers=headers,
+                consume=self.create_html_consumer(company_config)
+            )
+            return self.process_html_response(company_config, response)
+        
         except Exception as e:
             print(f"❌ Error: {e}")
-            return []
+            return None
     
-    def fetch_jobs(self, company_config):
-        """Route to appropriate fetch method"""
+    async def fetch_jobs_async(self, session, company_config):
+        """Route to appropriate fetch coroutine"""
+        if self.is_circuit_open(company_config):
+            return None
+        
         if 'api_url' in company_config:
-            return self.fetch_jobs_from_api(company_config)
+            jobs = await self.fetch_jobs_from_api_async(session, company_config)
         else:
-            return self.fetch_jobs_from_html(company_config)
+            jobs = await self.fetch_jobs_from_html_async(session, company_config)
+        
+        self.record_fetch_result(company_config, jobs)
+        return jobs
     
-    def check_for_new_jobs(self):
-        """Main monitoring loop with enhanced tracking"""
-        print("=" * 70)
-        print(f"🔍 JOB MONITOR - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 70)
+    async def fetch_all_companies_async(self, order, buffer, deadline=None):
+        """Fetch every company as coroutines, putting (index, jobs) in the buffer as boards finish
         
-        # Get current jobs from existing data
-        existing_jobs_dict = {job['id']: job for job in self.existing_data['jobs']}
+        Boards still unfinished at the deadline are cancelled and deferred;
+        they are never put in the buffer.
+        """
+        companies = self.config['companies']
+        semaphore = asyncio.Semaphore(max(1, int(self.config.get('max_concurrency', 1))))
+        started = set()
+        finished = set()
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_connections * self.pool_maxsize,
+            limit_per_host=self.pool_maxsize
+        )
         
-        # Track which jobs we've seen in this run
-        current_run_job_ids = set()
+        # Bodies are decompressed by http_client so the wire size can be measured
+        session_args = dict(
+            timeout=timeout, connector=connector, auto_decompress=False,
+            headers={'Accept-Encoding': ACCEPT_ENCODING}
+        )
         
-        all_new_jobs = []
-        all_current_jobs = []
+        async with aiohttp.ClientSession(**session_args) as session:
+            loop = asyncio.get_running_loop()
+            
+            async def fetch_bounded(index):
+                async with semaphore:
+                    started.add(index)
+                    jobs = await self.fetch_jobs_async(session, companies[index])
+                finished.add(index)
+                # Waits in a worker thread, not the event loop, while the merge stage catches up
+                await loop.run_in_executor(None, buffer.put, (index, jobs))
+            
+            tasks = {asyncio.create_task(fetch_bounded(index)): index for index in order}
+            if not tasks:
+                return
+            
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            done, pending = await asyncio.wait(tasks, timeout=remaining)
+            
+            for task in done:
+                task.result()
+            for task in sorted(pending, key=tasks.get):
+                index = tasks[task]
+                if index in finished:
+                    # Fetched in time, only waiting for room in the buffer
+                    continue
+                task.cancel()
+                self.defer_board(companies[index], index in started)
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    def iter_fetched_boards_async(self, order, deadline=None):
+        """Yield (company, jobs) as boards finish, with the event loop in a producer thread"""
+        companies = self.config['companies']
+        buffer = BoundedBuffer(self.get_pipeline_buffer_size())
+        errors = []
         
-        # Fetch jobs from all companies
-        for company in self.config['companies']:
-            current_jobs = self.fetch_jobs(company)
+        def produce():
+            try:
+                asyncio.run(self.fetch_all_companies_async(order, buffer, deadline))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                buffer.put(END)
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        pending = set(order)
+        
+        try:
+            for index, jobs in iter(buffer.get, END):
+                pending.discard(index)
+                yield companies[index], jobs
+        finally:
+            buffer.close()
+        
+        producer.join()
+        if errors:
+            raise errors[0]
+        
+        # Deferred boards were never delivered and keep their jobs unchanged
+        for index in sorted(pending):
+            yield companies[index], None
+    
+    def get_fetch_order(self, companies):
+        """Indexes of companies in fetch order: boards deferred last run go first"""
+        deferred_keys = self.board_cache.get_deferred()
+        rank = {key: position for position, key in enumerate(deferred_keys)}
+        return sorted(
+            range(len(companies)),
+            key=lambda index: rank.get(self.get_board_key(companies[index]), len(rank))
+        )
+    
+    def defer_board(self, company_config, started):
+        """Record a board that didn't finish before the run deadline"""
+        if started:
+            reason = f"still running after the {self.time_budget:g}s budget"
+        else:
+            reason = "not started before the deadline"
+        
+        self.deferred_boards[company_config['name']] = reason
+        print(f"\n⏱️ Deferring {company_config['name']} to the next run: {reason}")
+        if started:
+            # A board that always runs out of time would otherwise take a front slot every run
+            self.overrun_boards.add(company_config['name'])
+            failures = self.board_cache.record_overrun(self.get_board_key(company_config))
+            print(f"⚠️ {company_config['name']} failed or ran out of time {failures} time(s) in a row")
+    
+    def get_deferred_queue(self):
+        """Board keys deferred by this run: boards that never started first, then the ones that ran out of time
+        
+        Both groups keep this run's fetch order.
+        """
+        companies = self.config['companies']
+        deferred = [
+            companies[index] for index in self.get_fetch_order(companies)
+            if companies[index]['name'] in self.deferred_boards
+        ]
+        deferred.sort(key=lambda company: company['name'] in self.overrun_boards)
+        return [self.get_board_key(company) for company in deferred]
+    
+    def get_pipeline_buffer_size(self):
+        """Number of fetched boards that may wait for the merge stage"""
+        max_concurrency = max(1, int(self.config.get('max_concurrency', 1)))
+        return max(1, int(self.config.get('pipeline_buffer', max_concurrency)))
+    
+    def iter_fetched_boards(self, deadline=None):
+        """Yield (company, jobs) for every company as its board finishes
+        
+        Fetching runs ahead of the consumer by at most pipeline_buffer
+        boards. Boards that failed, or were still unfinished at the
+        deadline, come through with None; the unfinished ones are deferred
+        to the front of the next run's queue.
+        """
+        companies = self.config['companies']
+        order = self.get_fetch_order(companies)
+        
+        if self.engine == 'asyncio':
+            if aiohttp is not None:
+                yield from self.iter_fetched_boards_async(order, deadline)
+                return
+            print("⚠️ aiohttp is not installed, falling back to the threads engine")
+        
+        max_concurrency = max(1, int(self.config.get('max_concurrency', 1)))
+        
+        if deadline is None and (max_concurrency == 1 or len(companies) < 2):
+            for index in order:
+                yield companies[index], self.fetch_jobs(companies[index])
+            return
+        if not companies:
+            return
+        
+        buffer = BoundedBuffer(self.get_pipeline_buffer_size())
+        
+        def fetch_into_buffer(index):
+            try:
+                buffer.put((index, self.fetch_jobs(companies[index]), None))
+            except Exception as e:
+                buffer.put((index, None, e))
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_concurrency, len(companies)))
+        futures = {index: executor.submit(fetch_into_buffer, index) for index in order}
+        pending = set(order)
+        
+        try:
+            while pending:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                try:
+                    index, jobs, error = buffer.get(timeout=remaining)
+                except queue.Empty:
+                    # Running fetches stop at their next chunk or wait, and
+                    # whatever they still finish is ignored
+                    self.cancelled.set()
+                    self.board_cache.freeze()
+                    break
+                if error is not None:
+                    raise error
+                
+                pending.discard(index)
+                yield companies[index], jobs
             
+            buffer.close()
+            for index in sorted(pending):
+                # cancel() only succeeds for boards that never started
+                self.defer_board(companies[index], not futures[index].cancel())
+                yield companies[index], None
+        finally:
+            buffer.close()
+            executor.shutdown(wait=not pending, cancel_futures=True)
+    
+    def iter_job_changes(self, boards, jobs_by_id, seen_ids, unavailable_companies, board_job_ids=None):
+        """Merge fetched boards into jobs_by_id, yielding ('added' | 'seen', job) per job
+        
+        Companies whose board came back as None are added to
+        unavailable_companies. board_job_ids, if given, collects the ids
+        each company's board listed, in board order.
+        """
+        for company, current_jobs in boards:
+            if current_jobs is None:
+                unavailable_companies.add(company['name'])
+                continue
+            
+            listed_ids = board_job_ids.setdefault(company['name'], []) if board_job_ids is not None else None
             for job in current_jobs:
                 job_id = self.get_job_id(job)
-                current_run_job_ids.add(job_id)
+                seen_ids.add(job_id)
+                if listed_ids is not None:
+                    listed_ids.append(job_id)
                 
-                if job_id in existing_jobs_dict:
+                if job_id in jobs_by_id:
                     # Job already exists - update last_seen
-                    existing_job = existing_jobs_dict[job_id]
+                    existing_job = jobs_by_id[job_id]
                     existing_job['last_seen'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     existing_job['is_active'] = True
                     existing_job['is_new'] = self.is_job_new(existing_job['found_date'])
-                    all_current_jobs.append(existing_job)
+                    yield 'seen', existing_job
                 else:
                     # New job found
-                    new_job = {
+                    new_job = JobRecord({
                         'id': job_id,
                         **job,
                         'is_active': True,
                         'is_new': True,
                         'last_seen': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    all_new_jobs.append(new_job)
-                    all_current_jobs.append(new_job)
-                    print(f"\n🆕 NEW JOB at {job['company']}!")
-                    print(f"  📋 {job['title']}")
-                    print(f"  🏢 {job['department']}", end='')
-                    if job.get('location'):
-                        print(f" - {job['location']}", end='')
-                    print()
-                    if job.get('link'):
-                        print(f"  🔗 {job['link']}")
-        
-        # Mark jobs as inactive if they weren't seen in this run
-        for job_id, job in existing_jobs_dict.items():
-            if job_id not in current_run_job_ids:
-                if job.get('is_active', True):
-                    job['is_active'] = False
-                    print(f"\n⚠️ Job no longer available: {job['title']} at {job['company']}")
+                    })
+                    jobs_by_id[job_id] = new_job
+                    yield 'added', new_job
+    
+    def print_new_job(self, job):
+        """Announce a newly found job"""
+        print(f"\n🆕 NEW JOB at {job['company']}!")
+        print(f"  📋 {job['title']}")
+        print(f"  🏢 {job['department']}", end='')
+        if job.get('location'):
+            print(f" - {job['location']}", end='')
+        print()
+        if job.get('link'):
+            print(f"  🔗 {job['link']}")
+    
+    def mark_unseen_jobs(self, jobs_by_id, seen_ids, kept_companies):
+        """Mark jobs as inactive if they weren't seen in this run
+        
+        Jobs of the companies in kept_companies keep their current state.
+        """
+        for job_id, job in jobs_by_id.items():
+            if job_id in seen_ids or job.get('company') in kept_companies:
+                continue
+            if job.get('is_active', True):
+                job['is_active'] = False
+                print(f"\n⚠️ Job no longer available: {job['title']} at {job['company']}")
+            if job.get('is_new', True) is not False:
                 job['is_new'] = False
-                all_current_jobs.append(job)
+    
+    def order_jobs(self, jobs_by_id, board_job_ids):
+        """This run's jobs board by board in config order, then the unseen ones in their previous order"""
+        ordered = {}
+        for company in self.config['companies']:
+            for job_id in board_job_ids.get(company['name'], ()):
+                ordered.setdefault(job_id, jobs_by_id[job_id])
+        for job_id, job in jobs_by_id.items():
+            ordered.setdefault(job_id, job)
+        return list(ordered.values())
+    
+    def build_metadata(self, jobs, unloaded_jobs=0):
+        """Summary counts for the metadata block, in one pass over the jobs
+        
+        unloaded_jobs counts the jobs storage didn't load, all inactive and not new.
+        """
+        total = unloaded_jobs
+        active = new = 0
+        companies = set()
+        departments = set()
+        
+        for job in jobs:
+            total += 1
+            if job.get('is_new', False):
+                new += 1
+            if job.get('is_active', True):
+                active += 1
+                companies.add(job['company'])
+                departments.add(job['department'])
         
-        # Update metadata
-        companies = set(job['company'] for job in all_current_jobs if job.get('is_active', True))
-        departments = set(job['department'] for job in all_current_jobs if job.get('is_active', True))
-        active_jobs = [job for job in all_current_jobs if job.get('is_active', True)]
+        return {
+            "last_updated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "total_jobs": total,
+            "active_jobs": active,
+            "inactive_jobs": total - active,
+            "new_jobs": new,
+            "companies_count": len(companies),
+            "departments_count": len(departments)
+        }
+    
+    def check_for_new_jobs(self, time_budget=None):
+        """Main monitoring loop with enhanced tracking
         
+        time_budget (seconds, defaults to the 'run_time_budget' config key)
+        caps how long fetching may take; boards not done by then are deferred.
+        """
+        self.time_budget = time_budget if time_budget is not None else self.config.get('run_time_budget')
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        self.deferred_boards = {}
+        self.overrun_boards = set()
+        self.truncated_boards = {}
+        self.cancelled.clear()
+        self.board_cache.freeze(False)
+        
+        print("=" * 70)
+        print(f"🔍 JOB MONITOR - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("=" * 70)
+        
+        # Jobs by id, updated in place; the saved order is rebuilt by order_jobs
+        stored_jobs = self.existing_data['jobs']
+        if isinstance(stored_jobs, LazyJobs):
+            # Jobs of a binary snapshot are only decoded once they're touched
+            jobs_by_id = dict(zip(stored_jobs.ids, stored_jobs.entries()))
+        else:
+            jobs_by_id = {job['id']: job for job in stored_jobs}
+        board_job_ids = {}
+        
+        # Track which jobs we've seen in this run
+        current_run_job_ids = set()
+        self.run_stats = {
+            'cache_hits': 0, 'cache_misses': 0, 'unchanged_bodies': 0,
+            'wire_bytes': 0, 'body_bytes': 0
+        }
+        
+        all_new_jobs = []
+        
+        # Companies whose board could not be fetched keep their jobs as they are
+        unavailable_companies = set()
+        
+        # Each board is merged and its new jobs announced as soon as it is
+        # fetched, while the remaining boards are still downloading
+        boards = self.iter_fetched_boards(deadline)
+        changes = self.iter_job_changes(
+            boards, jobs_by_id, current_run_job_ids, unavailable_companies, board_job_ids
+        )
+        for change, job in changes:
+            if change == 'added':
+                all_new_jobs.append(job)
+                self.print_new_job(job)
+        
+        # Jobs of partly read boards may simply be past the point where reading stopped
+        kept_companies = unavailable_companies | set(self.truncated_boards)
+        self.mark_unseen_jobs(jobs_by_id, current_run_job_ids, kept_companies)
+        
+        jobs = self.order_jobs(jobs_by_id, board_job_ids)
+        # Announced as boards finished; returned in the saved order, whatever the engine
+        added = set(map(id, all_new_jobs))
+        all_new_jobs = [job for job in jobs if id(job) in added]
+        unloaded_jobs = self.existing_data.get('unloaded_jobs', 0)
         self.existing_data = {
-            "jobs": all_current_jobs,
-            "metadata": {
-                "last_updated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                "total_jobs": len(all_current_jobs),
-                "active_jobs": len(active_jobs),
-                "inactive_jobs": len(all_current_jobs) - len(active_jobs),
-                "new_jobs": len([j for j in all_current_jobs if j.get('is_new', False)]),
-                "companies_count": len(companies),
-                "departments_count": len(departments)
-            }
+            "jobs": jobs,
+            "metadata": self.build_metadata(jobs, unloaded_jobs)
         }
+        if unloaded_jobs:
+            self.existing_data['unloaded_jobs'] = unloaded_jobs
         
         # Save updated data
         self.save_data()
+        self.board_cache.set_deferred(self.get_deferred_queue())
+        self.board_cache.save(keys={self.get_board_key(company) for company in self.config['companies']})
         
         # Print summary
         print("\n" + "=" * 70)
@@ -370,14 +1249,40 @@ class JobMonitor:
         print(f"⚠️ Inactive jobs: {self.existing_data['metadata']['inactive_jobs']}")
         print(f"🏢 Companies: {self.existing_data['metadata']['companies_count']}")
         print(f"📁 Departments: {self.existing_data['metadata']['departments_count']}")
+        print(f"🗄️ Cache: {self.run_stats['cache_hits']} hits, {self.run_stats['cache_misses']} misses, "
+              f"{self.run_stats['unchanged_bodies']} unchanged bodies")
+        print(f"📦 Transferred: {format_bytes(self.run_stats['wire_bytes'])} "
+              f"({format_bytes(self.run_stats['body_bytes'])} decompressed)")
+        failed_companies = [
+            company['name'] for company in self.config['companies']
+            if company['name'] in unavailable_companies and company['name'] not in self.deferred_boards
+        ]
+        if failed_companies:
+            print(f"🔌 Unavailable boards (jobs unchanged): {', '.join(failed_companies)}")
+        if self.truncated_boards:
+            print(f"✂️ Partly read boards (unseen jobs unchanged): {len(self.truncated_boards)}")
+            for company in self.config['companies']:
+                if company['name'] in self.truncated_boards:
+                    print(f"   - {company['name']}: {self.truncated_boards[company['name']]}")
+        if self.deferred_boards:
+            print(f"⏱️ Deferred boards (jobs unchanged): {len(self.deferred_boards)}")
+            for company in self.config['companies']:
+                if company['name'] in self.deferred_boards:
+                    print(f"   - {company['name']}: {self.deferred_boards[company['name']]}")
         print("=" * 70)
         
         return all_new_jobs
 
 
 def main():
-    monitor = JobMonitor()
-    monitor.check_for_new_jobs()
+    parser = argparse.ArgumentParser(description='Monitor company job boards')
+    parser.add_argument('--config', default='job_config.json', help='path to the monitoring config')
+    parser.add_argument('--engine', choices=ENGINES, help='fetch engine (overrides the config)')
+    parser.add_argument('--time-budget', type=float, help='seconds allowed for fetching (overrides the config)')
+    args = parser.parse_args()
+    
+    monitor = JobMonitor(args.config, engine=args.engine)
+    monitor.check_for_new_jobs(time_budget=args.time_budget)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,1112 @@
+#!/usr/bin/env python3
+"""
+Storage backends for tracked jobs.
+
+Selected with the 'storage' block of the monitoring config:
+
+    {"backend": "json", "path": "tracked_jobs.json"}     (default)
+    {"backend": "sqlite", "path": "tracked_jobs.db", "export_json": "tracked_jobs.json"}
+    {"backend": "eventlog", "path": "tracked_jobs.events.ndjson",
+     "snapshot": "tracked_jobs.snapshot.json", "export_json": "tracked_jobs.json",
+     "compact_bytes": 8388608, "compact_hours": 168}
+    {"backend": "sharded", "path": "tracked_jobs", "export_json": "tracked_jobs.json"}
+    {"backend": "binary", "path": "tracked_jobs.jobsnap", "export_json": "tracked_jobs.json"}
+
+The JSON backend rewrites the whole file on every save. The SQLite
+backend keeps jobs in a table indexed by id, company and is_active and
+applies only the rows that changed since they were loaded, in a single
+transaction. Jobs the monitor moves to the front of the list get
+positions below all the others, so rows that didn't move keep theirs.
+It imports export_json on first use and rewrites it after every save so
+the website and the workflow commit keep seeing the usual layout (set
+export_json to null to skip that).
+
+The event log backend appends one NDJSON event per changed job
+(job_added, job_seen, job_deactivated, job_reactivated, job_updated)
+plus a run event holding the metadata and the ids of the jobs the run
+moved to the front of the list. Loading replays the log on top of the
+last compacted snapshot; once the log reaches compact_bytes or
+the snapshot is compact_hours old, the state is written to a new
+snapshot and the log starts over. Snapshots are numbered and the log
+starts with the number of the snapshot it follows, so a log left over
+by a crash during compaction is never replayed twice.
+
+The sharded backend keeps one JSON file per company in the path
+directory, next to a small manifest.json holding the metadata block and
+the shard and job counts of every company. A save rewrites only the
+shards of companies whose jobs changed, in parallel, so the shards of
+boards that failed, were skipped or are no longer configured are left
+alone. The monitor doesn't even read the shards of companies no longer
+configured once their jobs are all inactive and not new; the manifest
+counts stand in for them in the metadata. Each shard also lists the
+overall position of its jobs, which keeps the merged job order, and so
+export_json, the same as with the JSON backend.
+
+The binary backend writes a snapshot of length-prefixed records (each a
+compact JSON job) followed by the metadata, an index of job ids, record
+offsets and the company, is_active and is_new of every job, and a
+fixed-size trailer locating them. Loading reads only the trailer and
+the index. The monitor gets jobs it hasn't touched yet as LazyJobs,
+which answer the indexed fields from the index, so a job is decoded
+only when the run changes it or needs another of its fields; jobs that
+weren't changed are copied to the next snapshot as raw bytes.
+
+Loaded jobs are JobRecords, which note the fields set to a new value,
+so backends that can write single records (SQLite, the event log) only
+look at and write what changed. Files are replaced atomically and the
+SQLite changes go in one transaction, so a crash mid-save leaves the
+previous state.
+
+To write tracked_jobs.json from whatever backend is configured:
+
+    python3 storage.py [--config job_config.json] [--output tracked_jobs.json]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import json_codec
+
+DEFAULT_JSON_PATH = 'tracked_jobs.json'
+DEFAULT_SQLITE_PATH = 'tracked_jobs.db'
+DEFAULT_EVENT_LOG_PATH = 'tracked_jobs.events.ndjson'
+DEFAULT_SNAPSHOT_PATH = 'tracked_jobs.snapshot.json'
+DEFAULT_COMPACT_BYTES = 8 * 1024 * 1024
+DEFAULT_COMPACT_HOURS = 7 * 24
+DEFAULT_SHARD_DIRECTORY = 'tracked_jobs'
+MANIFEST_NAME = 'manifest.json'
+MAX_SHARD_WRITERS = 8
+DEFAULT_BINARY_PATH = 'tracked_jobs.jobsnap'
+BINARY_MAGIC = b'JOBSNAP2'
+# Record length prefix, and the trailer: metadata, id list, offset array,
+# index values and index codes positions
+RECORD_LENGTH = struct.Struct('<I')
+BINARY_TRAILER = struct.Struct('<QQQQQ8s')
+# Fields a binary snapshot keeps in its index, so they're read without decoding jobs
+INDEXED_FIELDS = ('company', 'is_active', 'is_new')
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Column order matches the key order of job records in tracked_jobs.json
+JOB_COLUMNS = (
+    'id', 'company', 'title', 'department', 'location', 'link',
+    'found_date', 'is_active', 'is_new', 'last_seen'
+)
+BOOLEAN_COLUMNS = ('is_active', 'is_new')
+# Key in the extra column listing the columns a job has no field for
+ABSENT_COLUMNS_KEY = '__absent__'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    company TEXT,
+    title TEXT,
+    department TEXT,
+    location TEXT,
+    link TEXT,
+    found_date TEXT,
+    is_active INTEGER,
+    is_new INTEGER,
+    last_seen TEXT,
+    extra TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_company ON jobs (company);
+CREATE INDEX IF NOT EXISTS jobs_is_active ON jobs (is_active);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class JobRecord(dict):
+    """A job dict that remembers which fields changed since it was loaded or saved"""
+    
+    __slots__ = ('changed',)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.changed = set(self)
+    
+    @classmethod
+    def loaded(cls, job):
+        """Wrap a job read from storage, with nothing to write yet"""
+        record = cls(job)
+        record.changed = set()
+        return record
+    
+    def __setitem__(self, key, value):
+        if key not in self or self[key] != value:
+            self.changed.add(key)
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.changed.add(key)
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+    
+    def pop(self, key, *default):
+        if key in self:
+            self.changed.add(key)
+        return super().pop(key, *default)
+    
+    def popitem(self):
+        key, value = super().popitem()
+        self.changed.add(key)
+        return key, value
+    
+    def clear(self):
+        self.changed.update(self)
+        super().clear()
+
+
+def changed_fields(job):
+    """Fields of a job that need writing; all of them unless it's a JobRecord"""
+    return job.changed if isinstance(job, JobRecord) else job.keys()
+
+
+def mark_saved(jobs):
+    """Forget the changes of jobs that were just written"""
+    for job in jobs:
+        if isinstance(job, JobRecord):
+            job.changed.clear()
+
+
+def load_records(data):
+    """Wrap the jobs of a tracked_jobs.json document in JobRecords"""
+    if isinstance(data, dict) and isinstance(data.get('jobs'), list):
+        data['jobs'] = [JobRecord.loaded(job) for job in data['jobs']]
+    return data
+
+
+def split_moved_to_front(old_ids, new_ids):
+    """Number of ids at the front of new_ids that were moved (or added) there
+    
+    The ids after them must be all the other old ids, in their old order,
+    as when the monitor puts the jobs seen in a run first. Returns None
+    when new_ids isn't ordered that way.
+    """
+    old_positions = {job_id: position for position, job_id in enumerate(old_ids)}
+    front = len(new_ids)
+    next_position = len(old_ids)
+    while front:
+        position = old_positions.get(new_ids[front - 1])
+        if position is None or position >= next_position:
+            break
+        next_position = position
+        front -= 1
+    
+    kept = sum(1 for job_id in new_ids if job_id in old_positions)
+    return front if kept == len(old_ids) else None
+
+
+def sort_keys(old_ids, old_keys, ids, first_key=None):
+    """Keys ordering ids, reusing the keys of old_ids (both in order) for jobs that didn't move
+    
+    Returns the keys, in the order of ids, and how many ids at the front
+    got a new one. Jobs moved (or added) to the front get keys below all
+    the others, so only their records need writing; ids in any other
+    order are numbered from 0. first_key is the lowest key of jobs kept
+    elsewhere, if any, which moved jobs go ahead of too.
+    """
+    if ids == old_ids:
+        return old_keys, 0
+    
+    front = split_moved_to_front(old_ids, ids)
+    if front is None:
+        if first_key is None:
+            return list(range(len(ids))), len(ids)
+        # Their order against the jobs kept elsewhere is unknown, so ahead of them
+        front = len(ids)
+    
+    lowest = old_keys[:1] + ([] if first_key is None else [first_key])
+    start = min(lowest, default=0) - front
+    moved = set(ids[:front])
+    keys = list(range(start, start + front))
+    keys.extend(key for job_id, key in zip(old_ids, old_keys) if job_id not in moved)
+    return keys, front
+
+
+def export_json(data, path):
+    """Write jobs and metadata in the tracked_jobs.json layout"""
+    if not isinstance(data['jobs'], list) or any(isinstance(job, LazyJob) for job in data['jobs']):
+        # Lazily loaded jobs are decoded to be written out
+        data = {"jobs": [decoded(job) for job in data['jobs']], "metadata": data['metadata']}
+    json_codec.write_pretty(data, path)
+
+
+class JsonStorage:
+    def __init__(self, path=DEFAULT_JSON_PATH):
+        """Store everything in a single JSON document"""
+        self.path = path
+    
+    def load(self):
+        """Return the stored document, or None when there is none yet"""
+        if not os.path.exists(self.path):
+            return None
+        
+        with open(self.path, 'rb') as f:
+            return load_records(json_codec.loads(f.read()))
+    
+    def save(self, data):
+        """Replace the document, returning the number of records written
+        
+        A single document can't be patched, so every job is written
+        whatever changed.
+        """
+        export_json(data, self.path)
+        mark_saved(data['jobs'])
+        return len(data['jobs'])
+
+
+class SqliteStorage:
+    def __init__(self, path=DEFAULT_SQLITE_PATH, export_path=DEFAULT_JSON_PATH):
+        """Store jobs as rows of an SQLite database"""
+        self.path = path
+        self.export_path = export_path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        # Job ids and row positions as last loaded or saved, in order
+        self.ids = []
+        self.positions = []
+    
+    def job_to_row(self, job, position):
+        row = []
+        extra = {key: value for key, value in job.items() if key not in JOB_COLUMNS}
+        absent = [column for column in JOB_COLUMNS if column not in job]
+        if absent:
+            # So a field the job doesn't have loads back missing, not as None
+            extra[ABSENT_COLUMNS_KEY] = absent
+        for column in JOB_COLUMNS:
+            value = job.get(column)
+            if column in BOOLEAN_COLUMNS and type(value) is bool:
+                value = int(value)
+            elif value is not None and (column in BOOLEAN_COLUMNS or type(value) is not str):
+                # Kept with the extra fields so it loads back with its own type
+                extra[column] = value
+                value = None
+            row.append(value)
+        return tuple(row) + (json_codec.dumps(extra) if extra else None, position)
+    
+    def row_to_job(self, row):
+        extra = row[len(JOB_COLUMNS)]
+        extra = json_codec.loads(extra) if extra else {}
+        absent = extra.pop(ABSENT_COLUMNS_KEY, ())
+        
+        job = {column: value for column, value in zip(JOB_COLUMNS, row) if column not in absent}
+        for column in BOOLEAN_COLUMNS:
+            if job.get(column) is not None:
+                job[column] = bool(job[column])
+        job.update(extra)
+        return job
+    
+    def load(self):
+        """Return jobs and metadata, importing export_json the first time"""
+        metadata = self.connection.execute("SELECT value FROM meta WHERE name = 'metadata'").fetchone()
+        if metadata is None:
+            if self.export_path and os.path.exists(self.export_path):
+                print(f"📦 Importing {self.export_path} into {self.path}...")
+                return JsonStorage(self.export_path).load()
+            return None
+        
+        columns = ', '.join(JOB_COLUMNS + ('extra', 'position'))
+        rows = self.connection.execute(f"SELECT {columns} FROM jobs ORDER BY position").fetchall()
+        self.ids = [row[0] for row in rows]
+        self.positions = [row[-1] for row in rows]
+        return {
+            "jobs": [JobRecord.loaded(self.row_to_job(row)) for row in rows],
+            "metadata": json_codec.loads(metadata[0])
+        }
+    
+    def save(self, data):
+        """Apply new, changed, moved and removed jobs in one transaction
+        
+        Returns the number of rows written.
+        """
+        ids = [job['id'] for job in data['jobs']]
+        positions, moved = sort_keys(self.ids, self.positions, ids)
+        changed = [
+            self.job_to_row(job, position)
+            for index, (job, position) in enumerate(zip(data['jobs'], positions))
+            if index < moved or changed_fields(job)
+        ]
+        removed = [(job_id,) for job_id in set(self.ids).difference(ids)]
+        
+        columns = JOB_COLUMNS + ('extra', 'position')
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT (id) DO UPDATE SET {updates}",
+                changed
+            )
+            self.connection.executemany("DELETE FROM jobs WHERE id = ?", removed)
+            self.connection.execute(
+                "INSERT INTO meta (name, value) VALUES ('metadata', ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+                (json_codec.dumps(data['metadata']),)
+            )
+        self.ids = ids
+        self.positions = positions
+        mark_saved(data['jobs'])
+        
+        if self.export_path:
+            export_json(data, self.export_path)
+        return len(changed) + len(removed)
+
+
+class EventLogStorage:
+    def __init__(self, path=DEFAULT_EVENT_LOG_PATH, snapshot_path=DEFAULT_SNAPSHOT_PATH,
+                 export_path=DEFAULT_JSON_PATH, compact_bytes=DEFAULT_COMPACT_BYTES,
+                 compact_hours=DEFAULT_COMPACT_HOURS):
+        """Store job changes as an append-only NDJSON event log"""
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.export_path = export_path
+        self.compact_bytes = compact_bytes
+        self.compact_hours = compact_hours
+        # Job ids as last loaded or saved, in order; other jobs are new
+        self.ids = []
+        self.compacted_at = None
+        self.generation = 0
+        self.needs_compaction = False
+    
+    def replay(self, jobs, keys, metadata, lines):
+        """Apply logged events to jobs and their sort keys (by id) and return the latest metadata
+        
+        A run's job events are only applied once its closing run event is
+        read, so a save cut short by a crash leaves no trace.
+        """
+        first_key = min(keys.values(), default=0)
+        next_key = max(keys.values(), default=-1) + 1
+        pending = []
+        torn = False
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                event = json_codec.loads(line)
+            except ValueError:
+                if number == len(lines):
+                    torn = True
+                    break
+                raise
+            
+            kind = event['event']
+            if kind == 'snapshot':
+                continue
+            if kind != 'run':
+                pending.append(event)
+                continue
+            
+            for job_event in pending:
+                if job_event['event'] == 'job_added':
+                    jobs[job_event['id']] = job_event['job']
+                    keys[job_event['id']] = next_key
+                    next_key += 1
+                elif job_event['id'] in jobs:
+                    jobs[job_event['id']].update(job_event['changes'])
+            pending = []
+            # Jobs the run moved ahead of all the others
+            front = event.get('front', ())
+            first_key -= len(front)
+            keys.update((job_id, first_key + key) for key, job_id in enumerate(front))
+            metadata = event['metadata']
+        
+        if pending or torn:
+            print(f"⚠️ Ignoring an unfinished save at the end of {self.path}")
+        return metadata
+    
+    def load(self):
+        """Return jobs and metadata from the snapshot and the events after it"""
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = json_codec.loads(f.read())
+        
+        lines = []
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                lines = f.read().splitlines()
+        
+        if snapshot is None and not lines:
+            # Start from the exported file, and write the first snapshot on save
+            self.needs_compaction = True
+            if self.export_path and os.path.exists(self.export_path):
+                print(f"📦 Importing {self.export_path} into {self.path}...")
+                return JsonStorage(self.export_path).load()
+            return None
+        
+        snapshot = snapshot or {"jobs": [], "metadata": {}}
+        self.compacted_at = snapshot.get('compacted_at')
+        self.generation = snapshot.get('generation', 0)
+        
+        if lines:
+            try:
+                header = json_codec.loads(lines[0])
+            except ValueError:
+                # Left to replay, which ignores a torn last line and rejects any other
+                header = {}
+            if header.get('event') == 'snapshot' and header['generation'] != self.generation:
+                # Compaction stopped after writing the snapshot; its events are all in it
+                print(f"⚠️ Ignoring {self.path}, it predates {self.snapshot_path}")
+                lines = []
+        
+        jobs = {job['id']: job for job in snapshot['jobs']}
+        keys = {job_id: key for key, job_id in enumerate(jobs)}
+        metadata = self.replay(jobs, keys, snapshot['metadata'], lines)
+        
+        self.ids = sorted(jobs, key=keys.__getitem__)
+        return {"jobs": [JobRecord.loaded(jobs[job_id]) for job_id in self.ids], "metadata": metadata}
+    
+    def diff(self, jobs, now):
+        """Events for the jobs added or changed since the last save"""
+        known_ids = set(self.ids)
+        events = []
+        for job in jobs:
+            if job['id'] not in known_ids:
+                events.append({"event": "job_added", "time": now, "id": job['id'], "job": job})
+                continue
+            
+            changes = {key: job[key] for key in changed_fields(job)}
+            if not changes:
+                continue
+            if 'is_active' in changes:
+                kind = 'job_reactivated' if job['is_active'] else 'job_deactivated'
+            elif 'last_seen' in changes:
+                kind = 'job_seen'
+            else:
+                kind = 'job_updated'
+            events.append({"event": kind, "time": now, "id": job['id'], "changes": changes})
+        return events
+    
+    def is_compaction_due(self, jobs, front):
+        """Whether this save should write a new snapshot instead of events"""
+        if self.needs_compaction or not self.compacted_at:
+            return True
+        
+        # Events can only add jobs, move them to the front and update them in place
+        if front is None:
+            return True
+        # ... and set fields, not remove them
+        if any(key not in job for job in jobs for key in changed_fields(job)):
+            return True
+        
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.compact_bytes:
+            return True
+        compacted_at = datetime.strptime(self.compacted_at, TIME_FORMAT)
+        return datetime.now() - compacted_at >= timedelta(hours=self.compact_hours)
+    
+    def compact(self, data, now):
+        """Write the whole state as a new snapshot and start a new log after it"""
+        generation = self.generation + 1
+        snapshot = {
+            "generation": generation,
+            "compacted_at": now,
+            "jobs": data['jobs'],
+            "metadata": data['metadata']
+        }
+        json_codec.write_pretty(snapshot, self.snapshot_path)
+        
+        # The new log replaces the old one whole, so its header is never torn
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json_codec.dumps({"event": "snapshot", "time": now, "generation": generation}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        
+        self.generation = generation
+        self.compacted_at = now
+        self.needs_compaction = False
+        print(f"🗜️ Compacted {self.path} into {self.snapshot_path}")
+    
+    def save(self, data):
+        """Append the changes since the last save, compacting when due
+        
+        Returns the number of records written.
+        """
+        now = datetime.now().strftime(TIME_FORMAT)
+        jobs = data['jobs']
+        ids = [job['id'] for job in jobs]
+        front = split_moved_to_front(self.ids, ids)
+        
+        if self.is_compaction_due(jobs, front):
+            self.compact(data, now)
+            written = len(jobs)
+        else:
+            events = self.diff(jobs, now)
+            run = {"event": "run", "time": now, "metadata": data['metadata']}
+            if front:
+                run['front'] = ids[:front]
+            events.append(run)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(json_codec.dumps(event) + '\n' for event in events))
+                f.flush()
+                os.fsync(f.fileno())
+            written = len(events) - 1
+        
+        self.ids = ids
+        mark_saved(jobs)
+        if self.export_path:
+            export_json(data, self.export_path)
+        return written
+
+
+def get_shard_name(company):
+    """File name of a company's shard, readable and unique per company"""
+    slug = re.sub(r'[^a-z0-9]+', '-', str(company).lower()).strip('-')[:40]
+    digest = hashlib.md5(str(company).encode('utf-8')).hexdigest()[:8]
+    return f"{slug or 'company'}-{digest}.json"
+
+
+class ShardedStorage:
+    def __init__(self, path=DEFAULT_SHARD_DIRECTORY, export_path=DEFAULT_JSON_PATH, companies=None):
+        """Store each company's jobs in its own file, plus a manifest
+        
+        companies, when given, are the only companies whose boards a run
+        fetches; shards of other companies are then only read if they
+        still hold jobs a run would change (active or new ones).
+        """
+        self.path = path
+        self.export_path = export_path
+        self.manifest_path = os.path.join(path, MANIFEST_NAME)
+        self.companies = None if companies is None else {str(company) for company in companies}
+        # Company -> (file name, job ids, positions) as last loaded or saved
+        self.shards = {}
+        # Company -> (file name, summary) of the shards left unread
+        self.unloaded = {}
+        # Company -> job counts of the shards read, as last loaded or saved
+        self.summaries = {}
+        # Ids and positions of the loaded jobs, in order
+        self.ids = []
+        self.positions = []
+    
+    def read_shard(self, file_name):
+        with open(os.path.join(self.path, file_name), 'rb') as f:
+            return json_codec.loads(f.read())
+    
+    def is_settled(self, company, summary):
+        """Whether a run leaves a shard's jobs as they are, so it needn't be read"""
+        if self.companies is None or company in self.companies or summary is None:
+            return False
+        return not summary['active'] and not summary['new']
+    
+    def load(self):
+        """Return jobs and metadata from the shards, importing export_json the first time
+        
+        When shards are left unread, the number of jobs in them is
+        returned as unloaded_jobs; they are all inactive and not new.
+        """
+        if not os.path.exists(self.manifest_path):
+            if self.export_path and os.path.exists(self.export_path):
+                print(f"📦 Importing {self.export_path} into {self.path}...")
+                return JsonStorage(self.export_path).load()
+            return None
+        
+        with open(self.manifest_path, 'rb') as f:
+            manifest = json_codec.loads(f.read())
+        summaries = manifest.get('summaries', {})
+        
+        positioned = []
+        for company, file_name in manifest['shards'].items():
+            if self.is_settled(company, summaries.get(company)):
+                self.unloaded[company] = (file_name, summaries[company])
+                continue
+            shard = self.read_shard(file_name)
+            jobs = [JobRecord.loaded(job) for job in shard['jobs']]
+            positioned.extend(zip(shard['positions'], jobs))
+            self.shards[company] = (file_name, [job['id'] for job in jobs], shard['positions'])
+            if company in summaries:
+                self.summaries[company] = summaries[company]
+        
+        positioned.sort(key=lambda item: item[0])
+        self.positions = [position for position, _ in positioned]
+        data = {"jobs": [job for _, job in positioned], "metadata": manifest['metadata']}
+        self.ids = [job['id'] for job in data['jobs']]
+        if self.unloaded:
+            data['unloaded_jobs'] = sum(summary['jobs'] for _, summary in self.unloaded.values())
+        return data
+    
+    def write_shard(self, file_name, company, positions, jobs):
+        json_codec.write_pretty(
+            {"company": company, "positions": positions, "jobs": jobs},
+            os.path.join(self.path, file_name)
+        )
+    
+    def export(self, data):
+        """Write export_json with the jobs of the unread shards merged back in"""
+        positioned = list(zip(self.positions, data['jobs']))
+        for file_name, _ in self.unloaded.values():
+            shard = self.read_shard(file_name)
+            positioned.extend(zip(shard['positions'], shard['jobs']))
+        positioned.sort(key=lambda item: item[0])
+        export_json({"jobs": [job for _, job in positioned], "metadata": data['metadata']}, self.export_path)
+    
+    def save(self, data):
+        """Rewrite the shards with changes, then the manifest
+        
+        Returns the number of records written.
+        """
+        # Moved jobs go ahead of the unread ones too, which all stay behind
+        first_position = min((summary['first'] for _, summary in self.unloaded.values()), default=None)
+        all_ids = [job['id'] for job in data['jobs']]
+        positions, _ = sort_keys(self.ids, self.positions, all_ids, first_position)
+        
+        groups = {}
+        for job, position in zip(data['jobs'], positions):
+            job_positions, jobs = groups.setdefault(job.get('company'), ([], []))
+            job_positions.append(position)
+            jobs.append(job)
+        
+        shards = {}
+        summaries = {}
+        writes = []
+        for company, (job_positions, jobs) in groups.items():
+            # JSON object keys are strings, whatever the company value is
+            key = str(company)
+            if key in self.unloaded:
+                raise ValueError(f"the shard of {key} was not loaded")
+            ids = [job['id'] for job in jobs]
+            file_name, old_ids, old_positions = self.shards.get(key, (get_shard_name(company), None, None))
+            shards[key] = (file_name, ids, job_positions)
+            if ids != old_ids or job_positions != old_positions or any(changed_fields(job) for job in jobs):
+                writes.append((file_name, company, job_positions, jobs))
+            elif key in self.summaries:
+                summaries[key] = self.summaries[key]
+                continue
+            summaries[key] = {
+                "jobs": len(jobs),
+                "first": job_positions[0],
+                "active": sum(1 for job in jobs if job.get('is_active', True)),
+                # Jobs a run would still mark as not new
+                "new": sum(1 for job in jobs if job.get('is_new', True) is not False)
+            }
+        
+        os.makedirs(self.path, exist_ok=True)
+        if writes:
+            # Every shard is a separate file, so they can be written side by side
+            with ThreadPoolExecutor(max_workers=min(MAX_SHARD_WRITERS, len(writes))) as executor:
+                list(executor.map(lambda write: self.write_shard(*write), writes))
+        
+        # The manifest decides which shards are current, so it goes last
+        files = {company: shard[0] for company, shard in shards.items()}
+        all_summaries = dict(summaries)
+        for company, (file_name, summary) in self.unloaded.items():
+            files[company] = file_name
+            all_summaries[company] = summary
+        json_codec.write_pretty({
+            "metadata": data['metadata'],
+            "shards": files,
+            "summaries": all_summaries
+        }, self.manifest_path)
+        for company, (file_name, _, _) in self.shards.items():
+            if company not in shards:
+                os.remove(os.path.join(self.path, file_name))
+        
+        self.shards = shards
+        self.summaries = summaries
+        self.ids = all_ids
+        self.positions = positions
+        mark_saved(data['jobs'])
+        if self.export_path:
+            self.export(data)
+        return sum(len(write[3]) for write in writes)
+
+
+class LazyJobs(Sequence):
+    """The jobs of a binary snapshot, decoded when first accessed"""
+    
+    def __init__(self, buffer, ids, offsets, index_values, index_codes):
+        self.buffer = buffer
+        self.ids = ids
+        self.offsets = offsets
+        # Per indexed field, its distinct values, and for every job the
+        # number of its value (-1 when it has none), field by field
+        self.index_values = index_values
+        self.index_codes = index_codes
+        self.records = [None] * len(ids)
+        # id() of each decoded record -> its index, to recognise it on save
+        self.indexes = {}
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        record = self.records[index]
+        if record is None:
+            record = JobRecord.loaded(json_codec.loads(self.read(index)))
+            self.records[index] = record
+            self.indexes[id(record)] = index % len(self)
+        return record
+    
+    def read(self, index):
+        """The encoded record at index, without decoding it"""
+        return read_record(self.buffer, self.offsets[index])
+    
+    def read_framed(self, index):
+        """The record at index with its length prefix, as stored"""
+        offset = self.offsets[index]
+        (length,) = RECORD_LENGTH.unpack_from(self.buffer, offset)
+        return self.buffer[offset:offset + RECORD_LENGTH.size + length]
+    
+    def entries(self):
+        """Every job, as its record if it was decoded, else as a LazyJob"""
+        return [
+            LazyJob(self, index) if record is None else record
+            for index, record in enumerate(self.records)
+        ]
+    
+    def indexed(self, index, key):
+        """(True, value) or (False, None) for a field the job has or lacks, as stored
+        
+        None when the answer needs the record: the field isn't indexed,
+        or the job was decoded and may have changed since.
+        """
+        if self.records[index] is not None:
+            return None
+        if key == 'id':
+            return True, self.ids[index]
+        if key not in INDEXED_FIELDS:
+            return None
+        
+        field = INDEXED_FIELDS.index(key)
+        code = self.index_codes[field * len(self.ids) + index]
+        return (False, None) if code < 0 else (True, self.index_values[field][code])
+    
+    def unchanged_index(self, job):
+        """The index of job if it was read from here and not changed since, else None"""
+        index = self.indexes.get(id(job))
+        if index is None or self.records[index] is not job or job.changed:
+            return None
+        return index
+
+
+class LazyJob:
+    """A job of a binary snapshot that answers indexed fields without decoding it
+    
+    Any other field, and any change, decodes the record, which then
+    stands in for the job.
+    """
+    
+    __slots__ = ('jobs', 'index')
+    
+    def __init__(self, jobs, index):
+        self.jobs = jobs
+        self.index = index
+    
+    @property
+    def record(self):
+        return self.jobs[self.index]
+    
+    @property
+    def decoded(self):
+        return self.jobs.records[self.index] is not None
+    
+    def get(self, key, default=None):
+        found = self.jobs.indexed(self.index, key)
+        if found is None:
+            return self.record.get(key, default)
+        return found[1] if found[0] else default
+    
+    def __getitem__(self, key):
+        found = self.jobs.indexed(self.index, key)
+        if found is None:
+            return self.record[key]
+        if not found[0]:
+            raise KeyError(key)
+        return found[1]
+    
+    def __contains__(self, key):
+        found = self.jobs.indexed(self.index, key)
+        return key in self.record if found is None else found[0]
+    
+    def __setitem__(self, key, value):
+        self.record[key] = value
+
+
+def decoded(job):
+    """A job as a plain record, decoding it if it is a LazyJob"""
+    return job.record if isinstance(job, LazyJob) else job
+
+
+class IndexBuilder:
+    """The index fields of the jobs of a new binary snapshot"""
+    
+    def __init__(self, lazy=None):
+        # Starting from the values of the snapshot read, whose codes stay valid
+        self.lazy = lazy
+        self.values = [list(values) for values in lazy.index_values] if lazy else [[] for _ in INDEXED_FIELDS]
+        # Per job, its index in the snapshot read, or -1 with its codes in added
+        self.sources = array('i')
+        self.added = {}
+        # Value -> code, per field
+        self.numbers = [
+            {self.number_key(value): code for code, value in enumerate(values)}
+            for values in self.values
+        ]
+    
+    @staticmethod
+    def number_key(value):
+        # Typed, so True and 1 stay apart; unhashable values go by their JSON text
+        try:
+            key = (type(value), value)
+            hash(key)
+        except TypeError:
+            key = json_codec.dumps(value)
+        return key
+    
+    def add_stored(self, index):
+        """Add the fields of the job at index in the snapshot read"""
+        self.sources.append(index)
+    
+    def add(self, job):
+        """Add the fields of a job record"""
+        job_codes = []
+        for field, key in enumerate(INDEXED_FIELDS):
+            if key not in job:
+                job_codes.append(-1)
+                continue
+            
+            value = job[key]
+            numbers = self.numbers[field]
+            number_key = self.number_key(value)
+            code = numbers.get(number_key)
+            if code is None:
+                code = numbers[number_key] = len(self.values[field])
+                self.values[field].append(value)
+            job_codes.append(code)
+        self.added[len(self.sources)] = job_codes
+        self.sources.append(-1)
+    
+    def sections(self):
+        """The encoded value lists and code arrays"""
+        count = len(self.lazy.ids) if self.lazy else 0
+        codes = array('i')
+        for field in range(len(INDEXED_FIELDS)):
+            if count:
+                # Stored jobs keep their codes, looked up all at once
+                stored_codes = self.lazy.index_codes[field * count:(field + 1) * count]
+                field_codes = array('i', map(stored_codes.__getitem__, self.sources))
+            else:
+                field_codes = array('i', [0]) * len(self.sources)
+            for position, job_codes in self.added.items():
+                field_codes[position] = job_codes[field]
+            codes.extend(field_codes)
+        if sys.byteorder != 'little':
+            codes.byteswap()
+        return json_codec.dumps(self.values).encode('utf-8'), codes.tobytes()
+
+
+def read_record(buffer, offset):
+    (length,) = RECORD_LENGTH.unpack_from(buffer, offset)
+    start = offset + RECORD_LENGTH.size
+    return buffer[start:start + length]
+
+
+def frame_record(data):
+    return RECORD_LENGTH.pack(len(data)) + data
+
+
+def read_array(typecode, data):
+    """An array of little-endian numbers"""
+    numbers = array(typecode)
+    numbers.frombytes(data)
+    if sys.byteorder != 'little':
+        numbers.byteswap()
+    return numbers
+
+
+class BinaryStorage:
+    def __init__(self, path=DEFAULT_BINARY_PATH, export_path=DEFAULT_JSON_PATH):
+        """Store jobs as a binary snapshot that is read lazily"""
+        self.path = path
+        self.export_path = export_path
+        self.jobs = None
+    
+    def load(self):
+        """Return the metadata and lazily decoded jobs, importing export_json the first time"""
+        if not os.path.exists(self.path):
+            if self.export_path and os.path.exists(self.export_path):
+                print(f"📦 Importing {self.export_path} into {self.path}...")
+                return JsonStorage(self.export_path).load()
+            return None
+        
+        with open(self.path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if len(buffer) < len(BINARY_MAGIC) + BINARY_TRAILER.size:
+            raise ValueError(f"{self.path} is not a job snapshot")
+        metadata_offset, ids_offset, offsets_offset, values_offset, codes_offset, magic = BINARY_TRAILER.unpack_from(
+            buffer, len(buffer) - BINARY_TRAILER.size
+        )
+        if magic != BINARY_MAGIC or buffer[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ValueError(f"{self.path} is not a job snapshot")
+        
+        self.jobs = LazyJobs(
+            buffer,
+            json_codec.loads(read_record(buffer, ids_offset)),
+            read_array('Q', read_record(buffer, offsets_offset)),
+            json_codec.loads(read_record(buffer, values_offset)),
+            read_array('i', read_record(buffer, codes_offset))
+        )
+        return {"jobs": self.jobs, "metadata": json_codec.loads(read_record(buffer, metadata_offset))}
+    
+    def save(self, data):
+        """Write a new snapshot, re-encoding only new and changed jobs
+        
+        The jobs may be the LazyJobs from load, or a list mixing records
+        and LazyJobs. Returns the number of records encoded.
+        """
+        jobs = data['jobs']
+        lazy = self.jobs
+        temp_path = f"{self.path}.tmp"
+        ids = []
+        offsets = array('Q')
+        index = IndexBuilder(lazy)
+        saved = []
+        encoded = 0
+        
+        with open(temp_path, 'wb') as f:
+            f.write(BINARY_MAGIC)
+            position = len(BINARY_MAGIC)
+            
+            for number in range(len(jobs)):
+                # Jobs never decoded are certainly unchanged
+                if jobs is lazy:
+                    job = lazy.records[number]
+                    stored = number if job is None else None
+                else:
+                    job = jobs[number]
+                    is_stored = isinstance(job, LazyJob) and job.jobs is lazy and not job.decoded
+                    stored = job.index if is_stored else None
+                
+                if stored is None:
+                    job = decoded(job)
+                    saved.append(job)
+                    # ... and decoded ones may be unchanged too
+                    stored = lazy.unchanged_index(job) if lazy else None
+                
+                if stored is not None:
+                    framed = lazy.read_framed(stored)
+                    ids.append(lazy.ids[stored])
+                    index.add_stored(stored)
+                else:
+                    encoded += 1
+                    if lazy:
+                        # Its bytes in the old snapshot are out of date now
+                        lazy.indexes.pop(id(job), None)
+                    framed = frame_record(json_codec.dumps(job).encode('utf-8'))
+                    ids.append(job['id'])
+                    index.add(job)
+                offsets.append(position)
+                f.write(framed)
+                position += len(framed)
+            
+            if sys.byteorder != 'little':
+                offsets.byteswap()
+            sections = []
+            for section in (json_codec.dumps(data['metadata']).encode('utf-8'),
+                            json_codec.dumps(ids).encode('utf-8'), offsets.tobytes(), *index.sections()):
+                sections.append(position)
+                framed = frame_record(section)
+                f.write(framed)
+                position += len(framed)
+            f.write(BINARY_TRAILER.pack(*sections, BINARY_MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        
+        mark_saved(saved)
+        if self.export_path:
+            export_json(data, self.export_path)
+        return encoded
+
+
+def create_storage(config, companies=None):
+    """Build the storage backend described by the monitoring config
+    
+    companies, when given, are the only companies a run fetches; the
+    sharded backend then reads just the shards a run can change.
+    """
+    storage_config = config.get('storage', {})
+    backend = storage_config.get('backend', 'json')
+    
+    if backend == 'json':
+        return JsonStorage(storage_config.get('path', DEFAULT_JSON_PATH))
+    if backend == 'sqlite':
+        return SqliteStorage(
+            storage_config.get('path', DEFAULT_SQLITE_PATH),
+            storage_config.get('export_json', DEFAULT_JSON_PATH)
+        )
+    if backend == 'eventlog':
+        return EventLogStorage(
+            storage_config.get('path', DEFAULT_EVENT_LOG_PATH),
+            storage_config.get('snapshot', DEFAULT_SNAPSHOT_PATH),
+            storage_config.get('export_json', DEFAULT_JSON_PATH),
+            storage_config.get('compact_bytes', DEFAULT_COMPACT_BYTES),
+            storage_config.get('compact_hours', DEFAULT_COMPACT_HOURS)
+        )
+    if backend == 'sharded':
+        return ShardedStorage(
+            storage_config.get('path', DEFAULT_SHARD_DIRECTORY),
+            storage_config.get('export_json', DEFAULT_JSON_PATH),
+            companies
+        )
+    if backend == 'binary':
+        return BinaryStorage(
+            storage_config.get('path', DEFAULT_BINARY_PATH),
+            storage_config.get('export_json', DEFAULT_JSON_PATH)
+        )
+    raise ValueError(f"unknown storage backend: {backend}")
+
+
+def main():
+    """Export the configured storage to tracked_jobs.json"""
+    parser = argparse.ArgumentParser(description='Export tracked jobs in the tracked_jobs.json layout')
+    parser.add_argument('--config', default='job_config.json', help='path to the monitoring config')
+    parser.add_argument('--output', default=DEFAULT_JSON_PATH, help='JSON file to write')
+    args = parser.parse_args()
+    
+    config = {}
+    if os.path.exists(args.config):
+        with open(args.config, 'r') as f:
+            config = json.load(f)
+    
+    data = create_storage(config).load()
+    if data is None:
+        print("❌ No tracked jobs stored yet")
+        return
+    
+    export_json(data, args.output)
+    print(f"💾 Exported {len(data['jobs'])} jobs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
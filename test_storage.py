@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for the storage backends.
+
+Usage:
+    python3 -m unittest test_storage
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from scrapping import JobMonitor
+from storage import (
+    BinaryStorage, EventLogStorage, JsonStorage, LazyJob, ShardedStorage, SqliteStorage, export_json
+)
+
+
+def make_jobs(count):
+    """Tracked jobs, with every third one inactive"""
+    return [
+        {
+            'id': f"{i:032x}",
+            'company': f"Company {i % 7}",
+            'title': f"Software Engineer {i}",
+            'department': ['Engineering', 'Data'][i % 2],
+            'location': 'Dubai, United Arab Emirates',
+            'link': f"https://boards.greenhouse.io/example/jobs/{i}",
+            'found_date': '2026-05-18 09:37:10',
+            'is_active': i % 3 != 0,
+            'is_new': False,
+            'last_seen': '2026-06-13 19:05:41'
+        }
+        for i in range(count)
+    ]
+
+
+def make_data(count=50):
+    """A tracked_jobs.json document with the fields a backend has to carry through unchanged"""
+    jobs = make_jobs(count)
+    jobs[0].update({'location': None, 'is_new': None, 'extra': {'tags': ['a', 'ß'], 'score': 0.5}})
+    jobs[1]['title'] = "Emoji 🚀 and \u2028 separators"
+    del jobs[2]['location'], jobs[2]['link']
+    jobs[3]['is_active'] = 1
+    jobs[4]['company'] = None
+    return {'jobs': jobs, 'metadata': {'last_updated': '2026-06-13 19:05:41', 'total_jobs': count}}
+
+
+class StorageRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+    
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+    
+    def open_backends(self):
+        """A fresh instance of every backend, all reading the same files"""
+        return {
+            'sqlite': SqliteStorage(self.path('tracked_jobs.db'), export_path=None),
+            'eventlog': EventLogStorage(
+                self.path('tracked_jobs.events.ndjson'), self.path('tracked_jobs.snapshot.json'), export_path=None
+            ),
+            'sharded': ShardedStorage(self.path('tracked_jobs'), export_path=None),
+            'binary': BinaryStorage(self.path('tracked_jobs.jobsnap'), export_path=None),
+        }
+    
+    def test_jobs_load_back_unchanged(self):
+        data = make_data()
+        for name, storage in self.open_backends().items():
+            storage.save(data)
+        
+        for name, storage in self.open_backends().items():
+            with self.subTest(backend=name):
+                loaded = storage.load()
+                self.assertEqual(list(loaded['jobs']), data['jobs'])
+                self.assertEqual(loaded['metadata'], data['metadata'])
+    
+    def test_export_matches_json_backend(self):
+        data = make_data()
+        JsonStorage(self.path('expected.json')).save(data)
+        with open(self.path('expected.json'), 'rb') as f:
+            expected = f.read()
+        
+        for name, storage in self.open_backends().items():
+            storage.save(data)
+        for name, storage in self.open_backends().items():
+            with self.subTest(backend=name):
+                export_json(storage.load(), self.path('exported.json'))
+                with open(self.path('exported.json'), 'rb') as f:
+                    self.assertEqual(f.read(), expected)
+    
+    def test_changes_and_moves_load_back(self):
+        data = make_data()
+        for storage in self.open_backends().values():
+            storage.save(data)
+        
+        expected = [dict(job) for job in data['jobs']]
+        expected[10]['is_active'] = False
+        # As the monitor orders them: jobs seen in the run first, then the others
+        front = [expected[30], expected[10], {**expected[0], 'id': 'added', 'company': 'Company 0'}]
+        expected = front + [job for job in expected if job not in front]
+        
+        for name, storage in self.open_backends().items():
+            loaded = storage.load()
+            jobs = {job['id']: job for job in loaded['jobs']}
+            jobs[expected[1]['id']]['is_active'] = False
+            storage.save({
+                'jobs': [jobs[expected[0]['id']], jobs[expected[1]['id']], front[2]]
+                        + [jobs[job['id']] for job in expected[3:]],
+                'metadata': data['metadata']
+            })
+        
+        for name, storage in self.open_backends().items():
+            with self.subTest(backend=name):
+                self.assertEqual(list(storage.load()['jobs']), expected)
+
+
+class BinarySnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.snapshot_path = os.path.join(self.directory.name, 'tracked_jobs.jobsnap')
+    
+    def test_unchanged_jobs_are_copied(self):
+        data = make_data()
+        BinaryStorage(self.snapshot_path, export_path=None).save(data)
+        
+        storage = BinaryStorage(self.snapshot_path, export_path=None)
+        loaded = storage.load()
+        loaded['jobs'][5]['is_active'] = False
+        self.assertEqual(storage.save(loaded), 1)
+        
+        data['jobs'][5]['is_active'] = False
+        self.assertEqual(list(BinaryStorage(self.snapshot_path, export_path=None).load()['jobs']), data['jobs'])
+    
+    def test_index_answers_without_decoding(self):
+        data = make_data()
+        data['jobs'][5]['company'] = ['not', 'a', 'string']
+        BinaryStorage(self.snapshot_path, export_path=None).save(data)
+        
+        jobs = BinaryStorage(self.snapshot_path, export_path=None).load()['jobs']
+        for job, entry in zip(data['jobs'], jobs.entries()):
+            self.assertIsInstance(entry, LazyJob)
+            for key in ('id', 'company', 'is_active', 'is_new'):
+                self.assertEqual(key in entry, key in job)
+                self.assertEqual(entry.get(key, 'missing'), job.get(key, 'missing'))
+        self.assertEqual(jobs.records.count(None), len(jobs))
+        
+        # Other fields need the record
+        self.assertEqual(jobs.entries()[1]['title'], data['jobs'][1]['title'])
+        self.assertIsNotNone(jobs.records[1])
+    
+    def test_monitor_decodes_only_the_jobs_it_changes(self):
+        data = {'jobs': make_jobs(300), 'metadata': {}}
+        BinaryStorage(self.snapshot_path, export_path=None).save(data)
+        
+        config_path = os.path.join(self.directory.name, 'job_config.json')
+        with open(config_path, 'w') as f:
+            json.dump({
+                'companies': [],
+                'storage': {'backend': 'binary', 'path': self.snapshot_path, 'export_json': None},
+                'fetch_cache_file': os.path.join(self.directory.name, 'fetch_cache.json')
+            }, f)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            monitor = JobMonitor(config_path)
+            monitor.check_for_new_jobs()
+        
+        # No board was fetched, so only the active jobs were marked inactive
+        active = [job for job in data['jobs'] if job['is_active']]
+        self.assertEqual(len(monitor.storage.jobs.records) - monitor.storage.jobs.records.count(None), len(active))
+        
+        for job in data['jobs']:
+            job['is_active'] = False
+        self.assertEqual(list(BinaryStorage(self.snapshot_path, export_path=None).load()['jobs']), data['jobs'])
+        self.assertEqual(monitor.existing_data['metadata']['inactive_jobs'], len(data['jobs']))
+
+
+if __name__ == "__main__":
+    unittest.main()